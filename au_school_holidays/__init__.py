@@ -0,0 +1,2 @@
+# Scrapes Australian school holiday dates, see get_school_dates in scraper.py
+# Nothing is imported here, so the command line can show --help without loading pandas, bs4 or requests
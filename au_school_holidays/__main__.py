@@ -0,0 +1,9 @@
+import sys
+from .cli import main
+
+# --------------------
+# Running the command line
+# --------------------
+
+if __name__ == '__main__':
+    sys.exit(main())
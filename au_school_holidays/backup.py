@@ -0,0 +1,46 @@
+import pathlib
+import pandas as pd
+from .pipeline import compact_page
+
+# Default location of the backup data, next to this module rather than the current working directory
+BACKUP_DATA_PATH = pathlib.Path(__file__).parent.resolve() / 'Backup Raw Data.csv'
+
+# Backup data already loaded in this process, as path to (file modified time, index)
+_loaded_backups = {}
+
+
+# -------
+# Function definition
+# -------
+
+# Loads the backup data as a dict of (Calendar_Year, State) to a dataframe of that year and state's periods
+# Only reads the file again if it has been modified since it was last loaded
+def load_backup_data(backup_data_path=None):
+    path = pathlib.Path(backup_data_path) if backup_data_path is not None else BACKUP_DATA_PATH
+    path = path.resolve()
+
+    # Reusing the loaded data if the file hasn't changed
+    modified_time = path.stat().st_mtime_ns
+    if path in _loaded_backups and _loaded_backups[path][0] == modified_time:
+        return _loaded_backups[path][1]
+
+    # Create a dataframe using that data
+    raw_data = pd.read_csv(path)
+
+    # Drop the note column
+    raw_data = raw_data.drop(['Note'], axis=1)
+
+    # Set datatypes for non-date rows, the same compact dtypes as the scraped pages
+    compact_page(raw_data)
+
+    # Set datatypes for date rows
+    raw_data['Start'] = pd.to_datetime(raw_data['Start'], format='%d/%m/%Y')
+    raw_data['Finish'] = pd.to_datetime(raw_data['Finish'], format='%d/%m/%Y')
+
+    # Splitting the data by year and state for direct lookups
+    backup_index = {(int(year), state): group
+                    for (year, state), group in raw_data.groupby(['Calendar_Year', 'State'], observed=True)}
+
+    _loaded_backups[path] = (modified_time, backup_index)
+
+    return backup_index
@@ -0,0 +1,154 @@
+import datetime
+import hashlib
+import json
+import os
+import pathlib
+import threading
+import time
+
+# Default time to live in seconds for each year bucket, None means entries never expire
+# Past years don't change once finished, the current and next year can still be updated
+DEFAULT_TTL = {'past': None,
+               'current': 6 * 60 * 60,
+               'future': 6 * 60 * 60}
+
+
+# -------
+# Class definitions
+# -------
+
+# Minimal stand-in for a requests.Response, used for pages served from the cache
+class CachedResponse:
+
+    def __init__(self, url, content, status_code=200, reason='OK', headers=None):
+        self.url = url
+        self.content = content
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers or {}
+        self.retries = 0
+
+    # Raises the same exception type as requests does for error status codes
+    # requests is only imported here, so serving pages from the cache doesn't need the network stack loaded
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            import requests
+            raise requests.exceptions.HTTPError(
+                f'{self.status_code} Error: {self.reason} for url: {self.url}', response=self)
+
+
+# On disk cache of page responses keyed by url
+# Bodies are stored one file per url, with an index.json holding the validators and timestamps
+class ResponseCache:
+
+    def __init__(self, folder, ttl=None, max_bytes=200 * 1024 * 1024):
+        self.folder = pathlib.Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.folder / 'index.json'
+        self.ttl = {**DEFAULT_TTL, **(ttl or {})}
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+
+        # Whether the index has changes that haven't been written yet, hits only update last_used in memory
+        self._dirty = False
+
+    # Reads the index from disk, starting empty if it is missing or unreadable
+    def _load_index(self):
+        try:
+            return json.loads(self.index_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    # Writes the index to a temp file first so a crash can't leave a half written index
+    def _save_index(self):
+        temp_path = self.index_path.with_suffix('.tmp')
+        temp_path.write_text(json.dumps(self._index))
+        os.replace(temp_path, self.index_path)
+        self._dirty = False
+
+    # Path of the file holding the body for a url
+    def _body_path(self, url):
+        return self.folder / (hashlib.sha256(url.encode()).hexdigest() + '.html')
+
+    # Returns the cache entry for a url including its body, or None if it isn't cached
+    # The index isn't written on a hit, its last_used is written with the next put, touch or flush
+    def get(self, url):
+        with self._lock:
+            entry = self._index.get(url)
+            if entry is None:
+                return None
+            try:
+                content = self._body_path(url).read_bytes()
+            except OSError:
+                # Dropping entries whose body file has gone missing
+                del self._index[url]
+                self._dirty = True
+                return None
+            entry['last_used'] = time.time()
+            self._dirty = True
+            return dict(entry, content=content)
+
+    # Writes the index if anything has changed since it was last written, called once a batch of fetches is done
+    def flush(self):
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    # Returns the urls held in the cache
+    def urls(self):
+        with self._lock:
+            return list(self._index)
+
+    # Checks if an entry is still within the time to live for the bucket its year falls in
+    def is_fresh(self, entry, year=None):
+        this_year = datetime.date.today().year
+        if year is not None and year < this_year:
+            bucket = 'past'
+        elif year is None or year == this_year:
+            bucket = 'current'
+        else:
+            bucket = 'future'
+        ttl = self.ttl[bucket]
+        return ttl is None or time.time() - entry['fetched_at'] < ttl
+
+    # Builds the request headers used to revalidate an entry with the server
+    @staticmethod
+    def conditional_headers(entry):
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    # Stores a successful response for a url
+    def put(self, url, response):
+        with self._lock:
+            self._body_path(url).write_bytes(response.content)
+            now = time.time()
+            self._index[url] = {'etag': response.headers.get('ETag'),
+                                'last_modified': response.headers.get('Last-Modified'),
+                                'fetched_at': now,
+                                'last_used': now,
+                                'size': len(response.content)}
+            self._evict()
+            self._save_index()
+
+    # Marks an entry as fetched now, used when the server confirms it hasn't changed
+    def touch(self, url):
+        with self._lock:
+            if url in self._index:
+                self._index[url]['fetched_at'] = time.time()
+                self._index[url]['last_used'] = time.time()
+                self._save_index()
+
+    # Removes the least recently used entries until the cache fits within max_bytes
+    def _evict(self):
+        total_bytes = sum(entry['size'] for entry in self._index.values())
+        for url, entry in sorted(self._index.items(), key=lambda item: item[1]['last_used']):
+            if total_bytes <= self.max_bytes:
+                break
+            self._body_path(url).unlink(missing_ok=True)
+            total_bytes -= entry['size']
+            del self._index[url]
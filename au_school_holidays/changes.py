@@ -0,0 +1,88 @@
+import hashlib
+import json
+import numpy as np
+import pandas as pd
+from .normalizing import clean_date_column, parse_date_column
+
+# Columns of the changes output
+CHANGE_COLUMNS = ['State', 'Calendar_Year', 'School_Period_Type', 'School_Period_Name', 'Change',
+                  'Old_Start', 'Old_Finish', 'New_Start', 'New_Finish']
+
+
+# -------
+# Function definitions
+# -------
+
+# Fingerprint of a page's raw content, pages with the same fingerprint don't need extracting again
+def page_fingerprint(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+# Fingerprint of the table extracted from a page, unchanged when only the rest of the page has changed
+def table_fingerprint(table_data):
+    return hashlib.sha256(json.dumps(table_data).encode()).hexdigest()
+
+
+# Checks for TBC markers in a column of date strings
+def _is_provisional(series):
+    return series.fillna('').str.contains('tbc', case=False, regex=False).to_numpy()
+
+
+# Checks whether any of a page's Start or Finish dates still has a TBC marker
+def has_provisional_dates(page_df):
+    return bool(_is_provisional(page_df['Start'].astype(str)).any() or
+                _is_provisional(page_df['Finish'].astype(str)).any())
+
+
+# Compares the previous and new page dataframes of a (State, Calendar_Year), returning a dataframe of changed periods
+# Periods are matched on name, in order where a name appears more than once. Each is 'added', 'removed',
+# 'finalized' where a TBC date has been confirmed, or 'changed' where its dates have changed. old_df is None for
+# pages which weren't stored before, so all their periods are added
+def compare_pages(old_df, new_df):
+    if old_df is None:
+        old_df = new_df.iloc[0:0]
+
+    # Matching periods on their name and how many times the name has come up before on the page
+    # Categorical columns are compared as strings, as the two pages' categories differ
+    def keyed(df):
+        return df.astype({column: object for column in ['State', 'School_Period_Type', 'School_Period_Name']}) \
+            .assign(Occurrence=df.groupby('School_Period_Name', observed=True).cumcount(), Row=np.arange(len(df))) \
+            .set_index(['School_Period_Name', 'Occurrence'])
+
+    merged_df = keyed(old_df).join(keyed(new_df), how='outer', lsuffix='_Old', rsuffix='_New')
+
+    # Keeping the order of the new page, with removed periods after it
+    merged_df = merged_df.iloc[np.argsort(merged_df['Row_New'].fillna(len(new_df) + merged_df['Row_Old']).to_numpy(),
+                                          kind='stable')]
+    old_present = merged_df['Start_Old'].notna().to_numpy()
+    new_present = merged_df['Start_New'].notna().to_numpy()
+
+    # Comparing dates once they're cleaned and parsed, so changes to the formatting alone aren't counted
+    both = old_present & new_present
+    dates_changed = np.zeros(len(merged_df), dtype=bool)
+    for column in ['Start', 'Finish']:
+        old_dates = parse_date_column(clean_date_column(merged_df[f'{column}_Old'].fillna(''), column))
+        new_dates = parse_date_column(clean_date_column(merged_df[f'{column}_New'].fillna(''), column))
+        dates_changed |= both & (old_dates != new_dates).to_numpy()
+    finalized = both & (_is_provisional(merged_df['Start_Old']) | _is_provisional(merged_df['Finish_Old'])) \
+        & ~(_is_provisional(merged_df['Start_New']) | _is_provisional(merged_df['Finish_New']))
+
+    change = pd.Series(None, index=merged_df.index, dtype=object)
+    change[new_present & ~old_present] = 'added'
+    change[old_present & ~new_present] = 'removed'
+    change[dates_changed] = 'changed'
+    change[finalized] = 'finalized'
+    merged_df = merged_df[change.notna().to_numpy()]
+    change = change.dropna()
+
+    return pd.DataFrame({
+        'State': merged_df['State_New'].fillna(merged_df['State_Old']).to_numpy(),
+        'Calendar_Year': merged_df['Calendar_Year_New'].fillna(merged_df['Calendar_Year_Old']).astype(int).to_numpy(),
+        'School_Period_Type': merged_df['School_Period_Type_New'].fillna(merged_df['School_Period_Type_Old'])
+        .to_numpy(),
+        'School_Period_Name': merged_df.index.get_level_values('School_Period_Name'),
+        'Change': change.to_numpy(),
+        'Old_Start': merged_df['Start_Old'].to_numpy(),
+        'Old_Finish': merged_df['Finish_Old'].to_numpy(),
+        'New_Start': merged_df['Start_New'].to_numpy(),
+        'New_Finish': merged_df['Finish_New'].to_numpy()}, columns=CHANGE_COLUMNS)
@@ -0,0 +1,159 @@
+import argparse
+import json
+import pathlib
+import sys
+
+# Output modes and parser backends accepted on the command line
+OUTPUT_MODES = ['startfinish', 'dayrows', 'binarydayrows', 'all']
+PARSER_BACKEND_NAMES = ['bs4', 'lxml', 'stream']
+OUTPUT_FORMAT_NAMES = ['csv', 'parquet', 'feather']
+
+
+# -------
+# Function definitions
+# -------
+
+# Builds the argument parser, with an option for each get_school_dates argument
+# Only the standard library is used here, so --help doesn't load pandas, bs4 or requests
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='au-school-holidays',
+        description='Scrape Australian school holiday dates and write them out as csv, parquet or feather.')
+
+    parser.add_argument('start_year', type=int, help='First calendar year to get dates for.')
+    parser.add_argument('end_year', type=int, help='Last calendar year to get dates for (inclusive).')
+    parser.add_argument('-o', '--output-folder', default='.',
+                        help='Folder the outputs are written to (default: the current folder).')
+    parser.add_argument('-m', '--output-mode', nargs='+', choices=OUTPUT_MODES, default=['startfinish'],
+                        help='One or more output modes, or all (default: startfinish).')
+    parser.add_argument('-t', '--targets', nargs='+', type=str.lower,
+                        help='States to get dates for, e.g. nsw vic (default: all states).')
+    parser.add_argument('--show-qa-printouts', action='store_true',
+                        help='Print QA information and the intermediate dataframes as the run goes.')
+    parser.add_argument('--qa-verbosity', type=int, choices=[0, 1, 2],
+                        help='0 prints nothing, 1 prints messages, 2 also prints dataframes.')
+    parser.add_argument('--keep-terms', dest='drop_terms', action='store_false',
+                        help="Keep the school term rows instead of dropping them.")
+    parser.add_argument('--max-workers', type=int, default=8,
+                        help='Most pages fetched at once across all sites (default: 8).')
+    parser.add_argument('--max-per-host', type=int, default=2,
+                        help='Most pages fetched at once from each state site (default: 2).')
+    parser.add_argument('--cache-folder',
+                        help='Folder for the on disk cache of fetched pages, no cache is used if not given.')
+    parser.add_argument('--cache-max-bytes', type=int, default=200 * 1024 * 1024,
+                        help='Size the cache is trimmed to, least recently used first (default: 200 MiB).')
+    parser.add_argument('--offline', action='store_true',
+                        help='Only serve pages from the cache, never touching the network.')
+    parser.add_argument('--store-folder',
+                        help='Folder holding the store of previously scraped pages, which is reused and updated.')
+    parser.add_argument('--parser-backend', choices=PARSER_BACKEND_NAMES, default='bs4',
+                        help='Library used to pull the table out of each page (default: bs4).')
+    parser.add_argument('--parse-workers', type=int,
+                        help='Worker processes to parse pages in, pages are parsed in this process if not given.')
+    parser.add_argument('--timeout', type=float, default=30,
+                        help='Seconds to wait for each request before it is retried (default: 30).')
+    parser.add_argument('--max-retries', type=int, default=3,
+                        help='Times a failed request is retried (default: 3).')
+    parser.add_argument('--backoff-factor', type=float, default=1,
+                        help='Seconds waited before the first retry, doubling each retry (default: 1).')
+    parser.add_argument('--backup-data-path',
+                        help='Csv of backup data for states and years that can\'t be scraped '
+                             '(default: Backup Raw Data.csv).')
+    parser.add_argument('-f', '--output-format', choices=OUTPUT_FORMAT_NAMES, default='csv',
+                        help='File format of the outputs (default: csv).')
+    parser.add_argument('--partition-by', nargs='+',
+                        help='Columns to split the data outputs by, e.g. State Calendar_Year.')
+    parser.add_argument('--states-list',
+                        help='Json file with a registry of state sites to use in place of STATES_LIST.')
+    parser.add_argument('--run-report',
+                        help='Path to write a json report of stage timings and counters to.')
+    parser.add_argument('--binary-state-mask', action='store_true',
+                        help='Add a State_Mask column packing the binarydayrows state columns into one integer.')
+    parser.add_argument('--binary-state-count', action='store_true',
+                        help='Add a State_Count column of the number of states with a 1 in binarydayrows.')
+    parser.add_argument('--database',
+                        help='SQLite database the normalized periods of each page are upserted into.')
+    parser.add_argument('--from-database', action='store_true',
+                        help='Write the data outputs from --database with SQL instead of scraping.')
+
+    return parser
+
+
+# Runs get_school_dates with the command line arguments, returning the exit code
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.from_database and args.database is None:
+        parser.error('--from-database requires --database')
+
+    # A single 'all' is passed through as is, otherwise the list of modes
+    output_mode = 'all' if 'all' in args.output_mode else args.output_mode
+
+    # Writing the outputs straight from the database, without loading the scraper
+    if args.from_database:
+        from .database import HolidayDatabase
+
+        with HolidayDatabase(args.database) as database:
+            database.export(args.output_folder,
+                            args.start_year,
+                            args.end_year,
+                            output_mode=output_mode,
+                            targets=args.targets,
+                            drop_terms=args.drop_terms,
+                            output_format=args.output_format,
+                            partition_by=args.partition_by)
+        return 0
+
+    # The scraper and its dependencies are only imported once the arguments are known to be good
+    from .scraper import get_school_dates
+    from .cache import ResponseCache
+
+    # Registry of state sites read from json, where year keys of alternate urls come back as strings
+    states_list = None
+    if args.states_list is not None:
+        states_list = json.loads(pathlib.Path(args.states_list).read_text())
+        for state in states_list.values():
+            state['altyears'] = {int(year): url for year, url in state.get('altyears', {}).items()}
+
+    cache = None
+    if args.cache_folder is not None:
+        cache = ResponseCache(args.cache_folder, max_bytes=args.cache_max_bytes)
+
+    get_school_dates(args.start_year,
+                     args.end_year,
+                     args.output_folder,
+                     output_mode=output_mode,
+                     targets=args.targets,
+                     show_qa_printouts=args.show_qa_printouts,
+                     drop_terms=args.drop_terms,
+                     max_workers=args.max_workers,
+                     max_per_host=args.max_per_host,
+                     cache=cache,
+                     offline=args.offline,
+                     store_folder=args.store_folder,
+                     parser_backend=args.parser_backend,
+                     timeout=args.timeout,
+                     max_retries=args.max_retries,
+                     backoff_factor=args.backoff_factor,
+                     backup_data_path=args.backup_data_path,
+                     output_format=args.output_format,
+                     partition_by=args.partition_by,
+                     states_list=states_list,
+                     qa_verbosity=args.qa_verbosity,
+                     run_report_path=args.run_report,
+                     keep_outputs=False,
+                     binary_state_mask=args.binary_state_mask,
+                     binary_state_count=args.binary_state_count,
+                     parse_workers=args.parse_workers,
+                     database_path=args.database)
+
+    return 0
+
+
+# --------------------
+# Running the command line
+# --------------------
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,280 @@
+import datetime
+import pathlib
+import sqlite3
+import pandas as pd
+from .writing import write_output
+
+# Tables and indexes of the database, created if they aren't there yet
+# Dates are held as ISO text, which sorts and compares the same as the dates themselves
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS periods (
+    State TEXT NOT NULL,
+    Calendar_Year INTEGER NOT NULL,
+    Page_Index INTEGER NOT NULL,
+    School_Period_Type TEXT NOT NULL,
+    School_Period_Name TEXT NOT NULL,
+    Start TEXT NOT NULL,
+    Finish TEXT NOT NULL,
+    Source TEXT NOT NULL,
+    Updated_At TEXT NOT NULL,
+    PRIMARY KEY (State, Calendar_Year, Page_Index)
+);
+CREATE INDEX IF NOT EXISTS periods_state_start_finish ON periods (State, Start, Finish);
+CREATE INDEX IF NOT EXISTS periods_year_state ON periods (Calendar_Year, State);
+
+CREATE TABLE IF NOT EXISTS missing_data (
+    State TEXT NOT NULL,
+    Calendar_Year INTEGER NOT NULL,
+    Type TEXT,
+    Source TEXT,
+    Retries INTEGER,
+    Backup_Status TEXT,
+    Updated_At TEXT NOT NULL,
+    PRIMARY KEY (State, Calendar_Year)
+);
+
+CREATE TABLE IF NOT EXISTS removed_rows (
+    State TEXT NOT NULL,
+    Calendar_Year INTEGER NOT NULL,
+    Period TEXT,
+    Start TEXT,
+    Finish TEXT,
+    Reason TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS removed_rows_year_state ON removed_rows (Calendar_Year, State);
+"""
+
+# Columns of the startfinish output, as given by the database
+STARTFINISH_COLUMNS = ['index', 'Calendar_Year', 'State', 'School_Period_Type', 'School_Period_Name', 'Start', 'Finish']
+
+# Output modes which can be generated from the database
+DATABASE_OUTPUT_MODES = ['startfinish', 'dayrows', 'binarydayrows']
+
+
+# -------
+# Class definition
+# -------
+
+# SQLite database holding the normalized periods of every page scraped, whatever range each run was for,
+# with the missing data and removed rows alongside. Each page is written as one batch in its own transaction,
+# and the outputs for any range are generated from it with SQL instead of scraping again
+class HolidayDatabase:
+
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # --------
+    # Writing
+    # --------
+
+    # Upserts the normalized periods of a (State, Calendar_Year) page, replacing its removed rows
+    # Periods no longer on the page are deleted, and a page that has been scraped is no longer missing
+    # Backup data is only written for pages which haven't been scraped, it never replaces scraped periods
+    def upsert_page(self, state, year, periods_df, removed_rows_df=None, source='scraped'):
+        updated_at = datetime.datetime.now().isoformat(timespec='seconds')
+        rows = [(state, year, int(page_index), period_type, period_name,
+                 start.strftime('%Y-%m-%d'), finish.strftime('%Y-%m-%d'), source, updated_at)
+                for page_index, period_type, period_name, start, finish
+                in zip(periods_df.index, periods_df['School_Period_Type'], periods_df['School_Period_Name'],
+                       periods_df['Start'], periods_df['Finish'])]
+
+        with self.connection:
+            if source == 'backup':
+                scraped = self.connection.execute(
+                    "SELECT 1 FROM periods WHERE State = ? AND Calendar_Year = ? AND Source != 'backup' LIMIT 1",
+                    (state, year)).fetchone()
+                if scraped is not None:
+                    return
+
+            self.connection.execute(
+                f"DELETE FROM periods WHERE State = ? AND Calendar_Year = ? "
+                f"AND Page_Index NOT IN ({', '.join('?' * len(rows))})",
+                (state, year, *[row[2] for row in rows]))
+            self.connection.executemany(
+                """INSERT INTO periods VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (State, Calendar_Year, Page_Index) DO UPDATE SET
+                   School_Period_Type = excluded.School_Period_Type,
+                   School_Period_Name = excluded.School_Period_Name,
+                   Start = excluded.Start,
+                   Finish = excluded.Finish,
+                   Source = excluded.Source,
+                   Updated_At = excluded.Updated_At""",
+                rows)
+
+            if source != 'backup':
+                self.connection.execute('DELETE FROM missing_data WHERE State = ? AND Calendar_Year = ?',
+                                        (state, year))
+
+            if removed_rows_df is not None:
+                self.connection.execute('DELETE FROM removed_rows WHERE State = ? AND Calendar_Year = ?',
+                                        (state, year))
+                removed_rows_df = removed_rows_df.reindex(columns=['Period', 'Start', 'Finish', 'Reason'])
+                self.connection.executemany(
+                    'INSERT INTO removed_rows VALUES (?, ?, ?, ?, ?, ?)',
+                    [(state, year, *[None if pd.isna(value) else str(value) for value in row[:3]],
+                      row[3] if isinstance(row[3], str) else 'Row has missing values')
+                     for row in removed_rows_df.itertuples(index=False, name=None)])
+
+    # Upserts the missing data records of a run, a list of the dicts in the missing data output
+    def upsert_missing(self, missing_dicts):
+        updated_at = datetime.datetime.now().isoformat(timespec='seconds')
+        rows = [(missing_dict['State'], int(missing_dict['Year']), missing_dict.get('Type'),
+                 missing_dict.get('Source'), missing_dict.get('Retries'), missing_dict.get('Backup Status'),
+                 updated_at)
+                for missing_dict in missing_dicts]
+        with self.connection:
+            self.connection.executemany(
+                """INSERT INTO missing_data VALUES (?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (State, Calendar_Year) DO UPDATE SET
+                   Type = excluded.Type,
+                   Source = excluded.Source,
+                   Retries = excluded.Retries,
+                   Backup_Status = excluded.Backup_Status,
+                   Updated_At = excluded.Updated_At""",
+                rows)
+
+    # ---------
+    # Querying
+    # ---------
+
+    # Builds the where clause and parameters picking periods by year range, states and period types
+    @staticmethod
+    def _period_filter(start_year, end_year, states=None, period_types=None):
+        clauses = ['Calendar_Year BETWEEN ? AND ?']
+        params = [start_year, end_year]
+        if states is not None:
+            clauses.append(f"State IN ({', '.join('?' * len(states))})")
+            params += [state.upper() for state in states]
+        if period_types is not None:
+            clauses.append(f"School_Period_Type IN ({', '.join('?' * len(period_types))})")
+            params += list(period_types)
+        return ' AND '.join(clauses), params
+
+    # Returns the startfinish output for a range of years, the same as get_school_dates gives
+    def startfinish(self, start_year, end_year, states=None, period_types=None):
+        where, params = self._period_filter(start_year, end_year, states, period_types)
+        startfinish_df = pd.read_sql_query(
+            f"""SELECT Page_Index AS "index", Calendar_Year, State, School_Period_Type, School_Period_Name,
+                       Start, Finish
+                FROM periods WHERE {where}
+                ORDER BY State, Start, Calendar_Year, Page_Index""",
+            self.connection, params=params)
+        startfinish_df['Start'] = pd.to_datetime(startfinish_df['Start'])
+        startfinish_df['Finish'] = pd.to_datetime(startfinish_df['Finish'])
+        return startfinish_df
+
+    # Common table expression of one row per date in each period picked, expanded with a recursive query
+    def _days_query(self, where):
+        return f"""WITH RECURSIVE days (Calendar_Year, State, School_Period_Type, School_Period_Name, Date, Finish,
+                                        Start, Page_Index) AS (
+                       SELECT Calendar_Year, State, School_Period_Type, School_Period_Name, Start, Finish,
+                              Start, Page_Index
+                       FROM periods WHERE {where} AND Start <= Finish
+                       UNION ALL
+                       SELECT Calendar_Year, State, School_Period_Type, School_Period_Name, date(Date, '+1 day'),
+                              Finish, Start, Page_Index
+                       FROM days WHERE Date < Finish)"""
+
+    # Returns the dayrows output for a range of years, the same as get_school_dates gives
+    def dayrows(self, start_year, end_year, states=None, period_types=None):
+        where, params = self._period_filter(start_year, end_year, states, period_types)
+        dayrows_df = pd.read_sql_query(
+            f"""{self._days_query(where)}
+                SELECT Calendar_Year, State, School_Period_Type, School_Period_Name, Date
+                FROM days
+                ORDER BY State, Date, Start, Calendar_Year, Page_Index""",
+            self.connection, params=params)
+        dayrows_df['Date'] = pd.to_datetime(dayrows_df['Date'])
+        return dayrows_df
+
+    # Returns the binarydayrows output for a range of years, the same as get_school_dates gives
+    # Each state's column is grouped in the query, with a column for each state in the range
+    def binarydayrows(self, start_year, end_year, states=None, period_types=None):
+        where, params = self._period_filter(start_year, end_year, states, period_types)
+        state_columns = [state for state, in self.connection.execute(
+            f'SELECT DISTINCT State FROM periods WHERE {where} ORDER BY State', params)]
+        state_selects = ''.join(f', MAX(State = ?) AS "{state}"' for state in state_columns)
+        binarydayrows_df = pd.read_sql_query(
+            f"""{self._days_query(where)}
+                SELECT Calendar_Year, School_Period_Type, Date{state_selects}
+                FROM days
+                GROUP BY Calendar_Year, School_Period_Type, Date
+                ORDER BY Calendar_Year, School_Period_Type, Date""",
+            self.connection, params=params + state_columns)
+        binarydayrows_df['Date'] = pd.to_datetime(binarydayrows_df['Date'])
+        return binarydayrows_df.astype({state: 'uint8' for state in state_columns})
+
+    # Returns the periods overlapping a range of dates, found with the (State, Start, Finish) index
+    def periods_between(self, start, finish, states=None):
+        start = pd.Timestamp(start).strftime('%Y-%m-%d')
+        finish = pd.Timestamp(finish).strftime('%Y-%m-%d')
+        if states is None:
+            states = [state for state, in self.connection.execute('SELECT DISTINCT State FROM periods')]
+        periods_df = pd.read_sql_query(
+            f"""SELECT Calendar_Year, State, School_Period_Type, School_Period_Name, Start, Finish
+                FROM periods
+                WHERE State IN ({', '.join('?' * len(states))}) AND Start <= ? AND Finish >= ?
+                ORDER BY State, Start""",
+            self.connection, params=[state.upper() for state in states] + [finish, start])
+        periods_df['Start'] = pd.to_datetime(periods_df['Start'])
+        periods_df['Finish'] = pd.to_datetime(periods_df['Finish'])
+        return periods_df
+
+    # Returns the missing data records for a range of years
+    def missing_data(self, start_year, end_year):
+        return pd.read_sql_query(
+            """SELECT Type, Source, Calendar_Year AS Year, State, Backup_Status AS "Backup Status", Retries,
+                      Updated_At
+               FROM missing_data WHERE Calendar_Year BETWEEN ? AND ?
+               ORDER BY State, Calendar_Year""",
+            self.connection, params=[start_year, end_year])
+
+    # Returns the removed rows for a range of years
+    def removed_rows(self, start_year, end_year):
+        return pd.read_sql_query(
+            """SELECT Calendar_Year AS Year, State, Period, Start, Finish, Reason
+               FROM removed_rows WHERE Calendar_Year BETWEEN ? AND ?
+               ORDER BY State, Calendar_Year, rowid""",
+            self.connection, params=[start_year, end_year])
+
+    # Writes the outputs for a range of years from the database, with the same file names as get_school_dates
+    # Returns a dict of output mode to the dataframe written for it
+    def export(self,
+               output_folder_target,
+               start_year,
+               end_year,
+               output_mode='startfinish',
+               targets=None,
+               drop_terms=True,
+               output_format='csv',
+               partition_by=None):
+        output_modes = DATABASE_OUTPUT_MODES if output_mode == 'all' \
+            else [output_mode] if isinstance(output_mode, str) else list(output_mode)
+        period_types = ['Holiday'] if drop_terms else None
+
+        output_dfs = {}
+        for mode in output_modes:
+            if mode not in DATABASE_OUTPUT_MODES:
+                raise ValueError(f'Entered output mode ({mode}) is incorrect, '
+                                 f'must be one of {DATABASE_OUTPUT_MODES}.')
+            output_dfs[mode] = getattr(self, mode)(start_year, end_year, states=targets, period_types=period_types)
+            write_output(output_dfs[mode],
+                         output_folder_target,
+                         f"AU School Hols - Data - {start_year}-{end_year} - {mode}",
+                         output_format=output_format,
+                         partition_by=partition_by)
+
+        return output_dfs
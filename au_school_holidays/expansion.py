@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+# Columns copied from each period onto every date it covers
+PERIOD_COLUMNS = ['Calendar_Year', 'State', 'School_Period_Type', 'School_Period_Name']
+
+
+# -------
+# Function definitions
+# -------
+
+# Repeats each value of a column a number of times, categoricals are repeated as their codes and stay categorical
+def _repeat_column(series, counts):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return pd.Categorical.from_codes(np.repeat(series.cat.codes.to_numpy(), counts), dtype=series.dtype)
+    return np.repeat(series.to_numpy(), counts)
+
+
+# Expands a dataframe of Start and Finish periods to one row per date in each period (inclusive)
+def expand_dayrows(combo_df):
+    # Period bounds as day precision arrays
+    starts = combo_df['Start'].to_numpy(dtype='datetime64[D]')
+    finishes = combo_df['Finish'].to_numpy(dtype='datetime64[D]')
+
+    # Number of days in each period, periods finishing before they start have no days
+    day_counts = np.maximum((finishes - starts).astype(np.int64) + 1, 0)
+
+    # Offset of each output row from the start of its period
+    period_first_rows = np.cumsum(day_counts) - day_counts
+    day_offsets = np.arange(day_counts.sum()) - np.repeat(period_first_rows, day_counts)
+
+    # Repeating each period's values once per day and building the whole frame in one go
+    dayrows_df = pd.DataFrame({column: _repeat_column(combo_df[column], day_counts) for column in PERIOD_COLUMNS})
+    dayrows_df['Date'] = (np.repeat(starts, day_counts) + day_offsets.astype('timedelta64[D]')) \
+        .astype('datetime64[ns]')
+
+    return dayrows_df
+
+
+# Columns of the binarydayrows output ahead of the state columns
+BINARY_KEY_COLUMNS = ['Calendar_Year', 'School_Period_Type', 'Date']
+
+
+# Builds the binarydayrows output straight from a dataframe of Start and Finish periods, without expanding to day rows
+# Has a row per (Calendar_Year, School_Period_Type, Date) covered in any state, and a uint8 column per state which
+# is 1 if the state has a period of that type covering the date, otherwise 0
+# state_mask adds a State_Mask column packing the state columns into one integer, bit 0 being the first state column
+# state_count adds a State_Count column of the number of states with a 1
+def build_binarydayrows(combo_df, state_mask=False, state_count=False):
+    # Period bounds as day numbers, periods finishing before they start cover no dates
+    starts = combo_df['Start'].to_numpy(dtype='datetime64[D]').astype(np.int64)
+    finishes = combo_df['Finish'].to_numpy(dtype='datetime64[D]').astype(np.int64)
+    covers_dates = finishes >= starts
+    if not covers_dates.any():
+        return pd.DataFrame(columns=BINARY_KEY_COLUMNS)
+    combo_df = combo_df[covers_dates]
+    starts = starts[covers_dates]
+    finishes = finishes[covers_dates]
+
+    # Codes for each (Calendar_Year, School_Period_Type) group and state, sorted so the rows and columns come out
+    # in the same order as a pivot table would give
+    group_codes, groups = pd.factorize(
+        pd.MultiIndex.from_arrays([combo_df['Calendar_Year'], combo_df['School_Period_Type']]), sort=True)
+    state_codes, states = pd.factorize(combo_df['State'], sort=True)
+
+    # Each group gets a block of rows, one per day from its first start to its last finish
+    group_first_days = np.full(len(groups), np.iinfo(np.int64).max)
+    group_last_days = np.full(len(groups), np.iinfo(np.int64).min)
+    np.minimum.at(group_first_days, group_codes, starts)
+    np.maximum.at(group_last_days, group_codes, finishes)
+    group_days = group_last_days - group_first_days + 1
+    group_first_rows = np.cumsum(group_days) - group_days
+
+    # Difference array, each period adds 1 on its first row and takes 1 away on the row after its last
+    # Periods only cover rows in their own group's block, so the cumulative sum down each state's column
+    # is the number of periods covering each row
+    first_rows = group_first_rows[group_codes] + starts - group_first_days[group_codes]
+    last_rows = first_rows + finishes - starts
+    differences = np.zeros((group_days.sum() + 1, len(states)), dtype=np.int32)
+    np.add.at(differences, (first_rows, state_codes), 1)
+    np.add.at(differences, (last_rows + 1, state_codes), -1)
+    state_matrix = (np.cumsum(differences[:-1], axis=0) > 0).view(np.uint8)
+
+    # Keeping the rows covered in at least one state
+    rows = np.flatnonzero(state_matrix.any(axis=1))
+    row_groups = np.repeat(np.arange(len(groups)), group_days)[rows]
+    state_matrix = state_matrix[rows]
+
+    binarydayrows_df = pd.DataFrame({
+        'Calendar_Year': groups.get_level_values(0).to_numpy()[row_groups],
+        'School_Period_Type': groups.get_level_values(1).to_numpy()[row_groups],
+        'Date': (group_first_days[row_groups] + rows - group_first_rows[row_groups]).astype('datetime64[D]')
+        .astype('datetime64[ns]')})
+    for state_code, state in enumerate(states):
+        binarydayrows_df[state] = state_matrix[:, state_code]
+
+    if state_mask:
+        bits = np.left_shift(state_matrix.astype(np.uint64), np.arange(len(states), dtype=np.uint64))
+        mask_dtype = next(dtype for dtype in [np.uint8, np.uint16, np.uint32, np.uint64]
+                          if len(states) <= np.iinfo(dtype).bits)
+        binarydayrows_df['State_Mask'] = bits.sum(axis=1, dtype=np.uint64).astype(mask_dtype)
+
+    if state_count:
+        binarydayrows_df['State_Count'] = state_matrix.sum(axis=1, dtype=np.uint8)
+
+    return binarydayrows_df
@@ -0,0 +1,172 @@
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from .cache import CachedResponse
+import datetime
+import threading
+import time
+import requests
+
+# Status codes which are worth retrying, as they are usually transient
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Longest time in seconds to wait between retries, including waits asked for by Retry-After
+MAX_RETRY_DELAY = 60
+
+
+# -------
+# Function definitions
+# -------
+
+# Reads a Retry-After header, which is either a number of seconds or a date, returning None if unusable
+def retry_after_seconds(response):
+    retry_after = response.headers.get('Retry-After')
+    if retry_after is None:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    # Dates in the -0000 form parse without a timezone, and are taken as UTC
+    # Anything that still can't be compared falls back to the exponential backoff
+    try:
+        retry_date = parsedate_to_datetime(retry_after)
+        if retry_date.tzinfo is None:
+            retry_date = retry_date.replace(tzinfo=datetime.timezone.utc)
+        return max(0.0, (retry_date - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def fetch_pages(urls,
+                max_workers=8,
+                max_per_host=2,
+                cache=None,
+                offline=False,
+                url_years=None,
+                timeout=30,
+                max_retries=3,
+                backoff_factor=1,
+                metrics=None):
+    # Sets the default value for the url_years argument, used to pick the cache time to live
+    if url_years is None:
+        url_years = {}
+
+    # Adds to a counter when metrics are being collected
+    def count(name, amount=1):
+        if metrics is not None:
+            metrics.count(name, amount)
+
+    # Removing duplicate urls while keeping their order
+    urls = list(dict.fromkeys(urls))
+
+    # One semaphore per host, caps the number of in-flight requests to each state site
+    host_limits = {urlparse(url).netloc: threading.BoundedSemaphore(max_per_host) for url in urls}
+
+    # One pooled keep-alive session per host, so each state site reuses its connections
+    sessions = {}
+    for host in host_limits:
+        sessions[host] = requests.Session()
+        sessions[host].mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=max_per_host))
+        sessions[host].mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=max_per_host))
+
+    # Fetches a single url while holding a slot for its host
+    # Retries 429/5xx responses and connection errors with exponential backoff, honouring Retry-After
+    # The number of retries is attached to the returned response, or the raised exception, as .retries
+    def fetch(url, headers=None):
+        host = urlparse(url).netloc
+        retries = 0
+        while True:
+            try:
+                count('requests')
+                with host_limits[host]:
+                    response = sessions[host].get(url, headers=headers, timeout=timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if retries >= max_retries:
+                    e.retries = retries
+                    raise
+                delay = backoff_factor * 2 ** retries
+            else:
+                count('bytes_downloaded', len(response.content))
+                if response.status_code not in RETRY_STATUSES or retries >= max_retries:
+                    response.retries = retries
+                    return response
+                delay = retry_after_seconds(response)
+                if delay is None:
+                    delay = backoff_factor * 2 ** retries
+
+            # Waiting outside the host's slot so other pages from the host can be fetched meanwhile
+            retries += 1
+            count('retries')
+            time.sleep(min(delay, MAX_RETRY_DELAY))
+
+    # Serves a url from the cache where possible, otherwise fetches and stores it
+    def fetch_cached(url):
+        entry = cache.get(url) if cache is not None else None
+
+        # Cached copies are always used when offline, otherwise only within their time to live
+        if entry is not None and (offline or cache.is_fresh(entry, url_years.get(url))):
+            count('cache_hits')
+            return CachedResponse(url, entry['content'])
+
+        # Counting urls which weren't in the cache at all, stale entries are counted when revalidated
+        if cache is not None and entry is None:
+            count('cache_misses')
+
+        # Offline mode never touches the network, so a cache miss is treated as an unavailable page
+        if offline:
+            return CachedResponse(url, b'', status_code=504, reason='Not in cache (offline mode)')
+
+        # Plain fetch when caching is off
+        if cache is None:
+            return fetch(url)
+
+        # Revalidating a stale entry, or doing a plain fetch if there isn't one
+        response = fetch(url, headers=cache.conditional_headers(entry) if entry is not None else None)
+
+        # Server confirmed the cached copy is unchanged
+        if response.status_code == 304 and entry is not None:
+            count('cache_revalidations')
+            cache.touch(url)
+            cached_response = CachedResponse(url, entry['content'])
+            cached_response.retries = response.retries
+            return cached_response
+
+        if response.status_code == 200:
+            cache.put(url, response)
+
+        return response
+
+    # Interleaving urls by host so workers aren't all queued up behind one host's cap
+    urls_by_host = {}
+    for url in urls:
+        urls_by_host.setdefault(urlparse(url).netloc, []).append(url)
+    submit_order = []
+    while any(urls_by_host.values()):
+        for host_urls in urls_by_host.values():
+            if host_urls:
+                submit_order.append(host_urls.pop(0))
+
+    # Fetching all urls, the executor's worker count acts as the global cap
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {url: executor.submit(fetch_cached, url) for url in submit_order}
+
+    # Closing the pooled connections
+    for session in sessions.values():
+        session.close()
+
+    # Writing the last used times of cache hits, which aren't written as each page is served
+    if cache is not None:
+        cache.flush()
+
+    # Collecting responses by url, exceptions are returned in place of a response so the caller
+    # can handle them at the same point the serial path would have raised them
+    results = {}
+    for url in urls:
+        try:
+            results[url] = futures[url].result()
+        except Exception as e:
+            results[url] = e
+
+    return results
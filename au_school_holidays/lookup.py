@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+
+# Multiplier putting each state's dates in their own block of keys, so every state can be searched at once
+STATE_KEY_STEP = 1 << 32
+
+
+# -------
+# Class definition
+# -------
+
+# In memory index of school periods, answering batches of "is date D a school holiday in state S" queries
+# Built from the startfinish output (or the combined dataframe it comes from). Periods are sorted by state
+# then Start, and each query is found with a single np.searchsorted over (state, date) keys
+class HolidayIndex:
+
+    def __init__(self, combo_df, period_types=('Holiday',)):
+        # Keeping only the period types being looked up, None keeps every type
+        if period_types is not None:
+            combo_df = combo_df[combo_df['School_Period_Type'].isin(period_types)]
+
+        # Sorting the periods by state then start date
+        combo_df = combo_df.sort_values(['State', 'Start', 'Finish'])
+        self.states = list(pd.unique(combo_df['State']))
+        state_ids = combo_df['State'].map({state: state_id for state_id, state in enumerate(self.states)}) \
+            .to_numpy(dtype=np.int64)
+
+        # Period bounds as day numbers
+        starts = combo_df['Start'].to_numpy(dtype='datetime64[D]').astype(np.int64)
+        finishes = combo_df['Finish'].to_numpy(dtype='datetime64[D]').astype(np.int64)
+
+        # Latest finish of any period in the same state starting on or before each period, used to find
+        # dates covered by an earlier, longer period where periods overlap
+        latest_finishes = finishes.copy()
+        first_periods = np.flatnonzero(np.diff(state_ids, prepend=-1))
+        for first, last in zip(first_periods, np.append(first_periods[1:], len(finishes))):
+            latest_finishes[first:last] = np.maximum.accumulate(finishes[first:last])
+
+        # Merging overlapping periods in each state, used to count holiday days without counting any day twice
+        new_run = np.ones(len(starts), dtype=bool)
+        new_run[1:] = (starts[1:] > latest_finishes[:-1]) | (state_ids[1:] != state_ids[:-1])
+        run_starts = np.flatnonzero(new_run)
+        merged_states = state_ids[new_run]
+        merged_starts = starts[new_run]
+        merged_finishes = np.maximum.reduceat(finishes, run_starts) if len(run_starts) else finishes
+        self._merged = {state: (merged_starts[merged_states == state_id], merged_finishes[merged_states == state_id])
+                        for state_id, state in enumerate(self.states)}
+
+        # Start, finish and latest finish keys, with the state in the key so a single comparison checks both the
+        # state and the date. Position 0 is a sentinel which starts before and finishes before every query, so
+        # queries before the first period of their state land on a period which doesn't cover them
+        sentinel = [np.iinfo(np.int64).min]
+        self._keys = np.concatenate([sentinel, state_ids * STATE_KEY_STEP + starts])
+        self._finish_keys = np.concatenate([sentinel, state_ids * STATE_KEY_STEP + finishes])
+        self._latest_finish_keys = np.concatenate([sentinel, state_ids * STATE_KEY_STEP + latest_finishes])
+
+        # Period names and types as codes, so results can be returned as categoricals without copying strings
+        # Factorized as plain strings, so the codes match the distinct values even if the columns are categorical
+        # The sentinel has a code of -1, which is a blank name and type
+        name_codes, self._names = pd.factorize(combo_df['School_Period_Name'].to_numpy(dtype=object))
+        type_codes, self._types = pd.factorize(combo_df['School_Period_Type'].to_numpy(dtype=object))
+        self._name_codes = np.append(-1, name_codes)
+        self._type_codes = np.append(-1, type_codes)
+
+    # Builds an index from a startfinish csv output
+    @classmethod
+    def from_csv(cls, path, period_types=('Holiday',)):
+        combo_df = pd.read_csv(path, parse_dates=['Start', 'Finish'])
+        return cls(combo_df, period_types=period_types)
+
+    # Finds the position of the period covering each (state id, day) query, or 0 (the sentinel) if there isn't one
+    # Where periods overlap the covering period which started last is used
+    def _find_periods(self, query_state_ids, days):
+        query_keys = query_state_ids * STATE_KEY_STEP + days
+
+        # Searching with the query keys in sorted order, which walks through the period keys once instead of
+        # jumping around them, and keeps every lookup into the periods in order
+        # Each query's position is packed into the low bits of its key, so a single plain sort gives both the
+        # sorted keys and the order to put the results back in, which is much faster than an argsort
+        index_bits = max(len(query_keys).bit_length(), 1)
+        packed_keys = np.sort((query_keys << index_bits) | np.arange(len(query_keys)))
+        query_order = packed_keys & ((1 << index_bits) - 1)
+        query_keys = packed_keys >> index_bits
+        positions = np.searchsorted(self._keys, query_keys, side='right') - 1
+
+        # Date is inside the last period starting on or before it in the same state
+        # A period from an earlier state always has a smaller finish key, so it never covers the date
+        covered = query_keys <= self._finish_keys[positions]
+
+        # Date is inside an earlier, longer period, these are rare so are found one at a time
+        # Going back stops at the sentinel at the latest, which has the smallest possible finish key
+        covered_earlier = np.flatnonzero(~covered & (query_keys <= self._latest_finish_keys[positions]))
+        for row in covered_earlier:
+            position = positions[row] - 1
+            while self._finish_keys[position] < query_keys[row]:
+                position -= 1
+            positions[row] = position
+        covered[covered_earlier] = True
+
+        # Putting the positions back in query order
+        query_positions = np.empty(len(query_keys), dtype=np.int64)
+        query_positions[query_order] = np.where(covered, positions, 0)
+        return query_positions
+
+    # Looks up a batch of dates and states, which are equal length array likes
+    # Returns a dataframe with a row per query, with the upper cased state as a categorical and the name and type
+    # of the period covering the date in that state, and Is_Holiday as False with blank names and types where
+    # there isn't one
+    def lookup(self, dates, states):
+        dates = pd.to_datetime(pd.Series(dates)).to_numpy(dtype='datetime64[D]')
+
+        # Working with a code per distinct state, so only the distinct states are upper cased and matched
+        # States which are the same once upper cased share a code, and missing states keep a code of -1
+        state_codes, distinct_states = pd.factorize(pd.Series(states, dtype=object))
+        upper_codes, upper_states = pd.factorize(pd.Index([str(state).upper() for state in distinct_states],
+                                                          dtype=object))
+        state_codes = np.append(upper_codes, -1)[state_codes]
+
+        # Id of each query's state, with -1 for states that aren't in the index or are missing
+        state_ids = {state: state_id for state_id, state in enumerate(self.states)}
+        query_state_ids = np.array([state_ids.get(state, -1) for state in upper_states] + [-1],
+                                   dtype=np.int64)[state_codes]
+
+        # Nothing is a holiday if the index has no periods, so there is nothing to search
+        if len(self._keys) == 1:
+            positions = np.zeros(len(dates), dtype=np.int64)
+        else:
+            positions = self._find_periods(query_state_ids, dates.astype(np.int64))
+
+        return pd.DataFrame({
+            'Date': dates.astype('datetime64[ns]'),
+            'State': pd.Categorical.from_codes(state_codes, categories=upper_states),
+            'Is_Holiday': positions > 0,
+            'School_Period_Name': pd.Categorical.from_codes(self._name_codes[positions], categories=self._names),
+            'School_Period_Type': pd.Categorical.from_codes(self._type_codes[positions], categories=self._types)})
+
+    # Returns a boolean array of whether each date is a school holiday in the matching state
+    def is_holiday(self, dates, states):
+        return self.lookup(dates, states)['Is_Holiday'].to_numpy()
+
+    # Returns the number of holiday days per state between two dates (inclusive), as a series indexed by state
+    def holiday_days(self, start, finish, states=None):
+        start = np.datetime64(pd.Timestamp(start).date(), 'D').astype(np.int64)
+        finish = np.datetime64(pd.Timestamp(finish).date(), 'D').astype(np.int64)
+        if states is None:
+            states = self.states
+
+        day_counts = {}
+        for state in states:
+            state = state.upper()
+            if state not in self._merged:
+                day_counts[state] = 0
+                continue
+
+            # Overlap of each merged period with the range
+            merged_starts, merged_finishes = self._merged[state]
+            overlap_days = np.minimum(merged_finishes, finish) - np.maximum(merged_starts, start) + 1
+            day_counts[state] = int(overlap_days[overlap_days > 0].sum())
+
+        return pd.Series(day_counts, name='Holiday_Days', dtype='int64')
@@ -0,0 +1,70 @@
+import contextlib
+import datetime
+import json
+import pathlib
+import threading
+import time
+
+# Stages of get_school_dates which are timed, in the order they run
+STAGES = ['fetch', 'parse', 'clean', 'backup_merge', 'combine', 'expansion', 'pivot', 'write']
+
+
+# -------
+# Class definition
+# -------
+
+# Collects stage timings and counters for a run of get_school_dates
+# Hooks are callables taking (event, name, value), called as each measurement is recorded, where event is
+# 'timing' with the seconds spent in one pass through a stage, or 'counter' with the amount added to a counter
+class RunMetrics:
+
+    def __init__(self, hooks=None):
+        self.hooks = list(hooks or [])
+        self.timings = {stage: 0.0 for stage in STAGES}
+        self.counters = {}
+        self.info = {}
+        self.started_at = datetime.datetime.now().isoformat(timespec='seconds')
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    # Adds a hook, called for every measurement recorded after it is added
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    # Calls each hook with a measurement
+    def _emit(self, event, name, value):
+        for hook in self.hooks:
+            hook(event, name, value)
+
+    # Context manager adding the time spent inside it to a stage, stages can be timed in several passes
+    @contextlib.contextmanager
+    def timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.timings[stage] = self.timings.get(stage, 0.0) + elapsed
+            self._emit('timing', stage, elapsed)
+
+    # Adds an amount to a counter, safe to call from the fetching threads
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+        self._emit('counter', name, amount)
+
+    # Returns the measurements so far as a json serialisable dict
+    def report(self):
+        with self._lock:
+            return {'started_at': self.started_at,
+                    'total_seconds': time.perf_counter() - self._start,
+                    'info': dict(self.info),
+                    'timings': dict(self.timings),
+                    'counters': dict(self.counters)}
+
+    # Writes the report to a json file, returning the path written to
+    def write_report(self, path):
+        path = pathlib.Path(path)
+        path.write_text(json.dumps(self.report(), indent=2, default=str))
+        return path
@@ -0,0 +1,92 @@
+import datetime
+import functools
+import re
+import pandas as pd
+
+# Format of the date strings once they have been cleaned
+DATE_FORMAT = '%A %d %B %Y'
+
+# Text removed or replaced in date strings to establish consistent formatting, by column
+# Each is a literal string and what it is replaced with
+DATE_REPLACEMENTS = {'Start': {',': '',
+                               '(tbc)': '',
+                               '(TBC)': '',
+                               '*': ''},
+                     'Finish': {',': '',
+                                '(tbc)': '',
+                                '(TBC)': '',
+                                ' TBC': '',
+                                '*': '',
+                                ' (Easter Monday Holiday)': '',
+                                'End of January 2026': 'Tuesday 2 January 2026'}}
+
+# Spot replacements for missing data (CHECK THESE AS NEW INFO COMES IN)
+# Each is the state and cleaned start date of a period, and the finish date it is given
+SPOT_REPLACEMENTS = [('NSW', 'Wednesday 21 December 2016', 'Tuesday 2 February 2017'),
+                     ('QLD', 'Saturday 13 December 2025', 'Monday 26 January 2026'),  # Estimate
+                     ('SA', 'Saturday 13 December 2025', 'Monday 26 January 2026'),  # Estimate
+                     ('WA', 'Friday 19 December 2025', 'Sunday 1 February 2026'),  # Per Gov
+                     ('ACT', 'Friday 19 December 2025', 'Sunday 1 February 2026')]  # Estimate
+
+# Brackets at the end of strings are removed from finish dates once the other replacements are done
+BRACKETS_AT_END = re.compile(r" \(.+?\)$")
+
+
+# Compiles the replacements for a column and the number suffixes (1st, 2nd, 3rd, 4th) into one pattern
+def _compile_replacements(replacements):
+    # Longest strings first so that e.g. ' (Easter Monday Holiday)' is matched ahead of shorter strings
+    literals = sorted(replacements, key=len, reverse=True)
+    return re.compile('|'.join([re.escape(literal) for literal in literals] + [r'(?P<day>\d+)(?:st|nd|rd|th)']))
+
+
+DATE_PATTERNS = {column: _compile_replacements(replacements) for column, replacements in DATE_REPLACEMENTS.items()}
+
+
+# -------
+# Function definitions
+# -------
+
+# Cleans a single date string, memoized as the same strings repeat across states, years and runs
+@functools.lru_cache(maxsize=None)
+def clean_date_string(text, column):
+    replacements = DATE_REPLACEMENTS[column]
+
+    # Replacing the listed strings and removing number suffixes in one pass
+    cleaned = DATE_PATTERNS[column].sub(
+        lambda match: match.group('day') if match.group('day') is not None else replacements[match.group(0)], text)
+
+    # Removing brackets at the end of finish dates
+    if column == 'Finish':
+        cleaned = BRACKETS_AT_END.sub('', cleaned)
+
+    return cleaned.strip()
+
+
+# Parses a single cleaned date string, returning NaT if it isn't in the expected format
+@functools.lru_cache(maxsize=None)
+def parse_date_string(text):
+    try:
+        return pd.Timestamp(datetime.datetime.strptime(text, DATE_FORMAT))
+    except (TypeError, ValueError):
+        return pd.NaT
+
+
+# Cleans a column of date strings, processing each distinct string once and mapping the results back
+def clean_date_column(series, column):
+    codes, uniques = pd.factorize(series)
+    cleaned = pd.Index([clean_date_string(text, column) for text in uniques], dtype=object)
+    return pd.Series(cleaned.take(codes), index=series.index)
+
+
+# Parses a column of cleaned date strings, parsing each distinct string once and mapping the results back
+# Strings which can't be parsed come back as NaT
+def parse_date_column(series):
+    codes, uniques = pd.factorize(series)
+    parsed = pd.DatetimeIndex([parse_date_string(text) for text in uniques], dtype='datetime64[ns]')
+    return pd.Series(parsed.take(codes, allow_fill=True, fill_value=pd.NaT), index=series.index)
+
+
+# Applies the spot replacements to a dataframe with cleaned Start and Finish strings, in place
+def apply_spot_replacements(df):
+    for state, start, finish in SPOT_REPLACEMENTS:
+        df.loc[(df['Start'] == start) & (df['State'] == state), 'Finish'] = finish
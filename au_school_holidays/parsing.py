@@ -0,0 +1,186 @@
+from html.parser import HTMLParser
+
+# Size of the chunks fed to the streaming parser, it stops feeding once the first table has closed
+STREAM_CHUNK_SIZE = 16 * 1024
+
+
+# -------
+# Function definitions
+# -------
+
+# Each backend takes the raw page content and returns the first table as a list of rows,
+# where each row is a list of cell texts. Returns an empty list if the page has no table.
+# Parser libraries are imported when a backend is first used, so importing this module stays cheap.
+
+# Parses only the table elements of the page with BeautifulSoup
+def extract_table_bs4(content):
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    # Create a BeautifulSoup object which only builds the tree for table elements
+    soup = BeautifulSoup(content, "html.parser", parse_only=SoupStrainer("table"))
+
+    # Find the first table element on the page
+    table = soup.find("table")
+    if table is None:
+        return []
+
+    # Extract the table data and store it in a list
+    table_data = []
+    for row in table.find_all("tr"):
+        row_data = []
+        for cell in row.find_all(["th", "td"]):
+            row_data.append(cell.get_text(strip=True))
+        table_data.append(row_data)
+
+    return table_data
+
+
+# Decodes the page to text, falling back to BeautifulSoup's encoding detection for non utf-8 pages
+# Used by the backends which don't detect the encoding themselves, so they read the same text as bs4 does
+def _decode_page(content):
+    try:
+        return content.decode('utf-8')
+    except UnicodeDecodeError:
+        from bs4 import UnicodeDammit
+        return UnicodeDammit(content).unicode_markup
+
+
+# Parses the page with lxml, which is an optional dependency
+# lxml reads bytes without a <meta charset> as Latin-1, so it is given the decoded text instead
+def extract_table_lxml(content):
+    import lxml.html
+
+    # Find the first table element on the page
+    # Text with an xml encoding declaration can't be given to lxml, those pages are left for it to decode
+    try:
+        root = lxml.html.fromstring(_decode_page(content))
+    except ValueError:
+        root = lxml.html.fromstring(content)
+    tables = root.xpath('//table')
+    if not tables:
+        return []
+
+    # Extract the table data, joining stripped text the same way as get_text(strip=True)
+    # Text inside script and style elements is left out, as it is by get_text
+    table_data = []
+    for row in tables[0].iter('tr'):
+        row_data = []
+        for cell in row.iter('th', 'td'):
+            cell_text = cell.xpath('.//text()[not(ancestor::script) and not(ancestor::style)]')
+            row_data.append(''.join(text.strip() for text in cell_text))
+        table_data.append(row_data)
+
+    return table_data
+
+
+# html.parser based parser which only collects the first table and ignores everything else
+# Rows and cells of tables nested in a cell are collected the same way bs4 and lxml do: every row inside the
+# first table is a row of the output, each row has every cell inside it including those of nested tables,
+# and each cell's text includes the text of the cells nested in it. Cells and rows left open are closed by the
+# next cell or row of the same table, as lxml does, where bs4's html.parser tree nests them instead
+class _FirstTableParser(HTMLParser):
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.finished = False
+        self._rows = []
+        self._skip_depth = 0
+        self._text = []
+
+        # One [open row, open cell] per open table, the outermost first
+        # Rows are lists of cells, and cells are lists of their stripped strings
+        self._tables = []
+
+    # Rows in the output format, with each cell's strings joined
+    @property
+    def table_data(self):
+        return [[''.join(cell) for cell in row] for row in self._rows]
+
+    # Adds the text collected since the last tag to every open cell, stripped like get_text(strip=True)
+    # Text is collected until the next tag as html.parser can split one string over several calls
+    def _flush_text(self):
+        stripped = ''.join(self._text).strip()
+        self._text = []
+        if stripped and not self._skip_depth:
+            for _, cell in self._tables:
+                if cell is not None:
+                    cell.append(stripped)
+
+    def handle_starttag(self, tag, attrs):
+        if self.finished:
+            return
+        self._flush_text()
+        if tag == 'table':
+            self._tables.append([None, None])
+        elif not self._tables:
+            return
+        elif tag == 'tr':
+            # A new row closes the open row of the same table
+            row = []
+            self._rows.append(row)
+            self._tables[-1] = [row, None]
+        elif tag in ('th', 'td'):
+            # A new cell closes the open cell of the same table, and is in every open row
+            cell = []
+            open_rows = [row for row, _ in self._tables if row is not None]
+            if not open_rows:
+                return
+            for row in open_rows:
+                row.append(cell)
+            self._tables[-1][1] = cell
+        elif tag in ('script', 'style'):
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if self.finished or not self._tables:
+            return
+        self._flush_text()
+        if tag == 'table':
+            self._tables.pop()
+            if not self._tables:
+                self.finished = True
+        elif tag == 'tr':
+            self._tables[-1] = [None, None]
+        elif tag in ('th', 'td'):
+            self._tables[-1][1] = None
+        elif tag in ('script', 'style'):
+            self._skip_depth = max(0, self._skip_depth - 1)
+
+    def handle_data(self, data):
+        if any(cell is not None for _, cell in self._tables):
+            self._text.append(data)
+
+    # Comments aren't part of the cell text, but do separate the strings either side of them
+    def handle_comment(self, data):
+        self._flush_text()
+
+
+# Streams the page through html.parser, stopping once the first table has closed
+def extract_table_stream(content):
+    markup = _decode_page(content)
+
+    parser = _FirstTableParser()
+    for position in range(0, len(markup), STREAM_CHUNK_SIZE):
+        parser.feed(markup[position:position + STREAM_CHUNK_SIZE])
+        if parser.finished:
+            break
+    else:
+        # Flushing any text left at the end of the page, for tables left open
+        parser.close()
+        parser._flush_text()
+
+    return parser.table_data
+
+
+# Available backends by name
+PARSER_BACKENDS = {'bs4': extract_table_bs4,
+                   'lxml': extract_table_lxml,
+                   'stream': extract_table_stream}
+
+
+# Extracts the first table from a page with the chosen backend
+def extract_table(content, backend='bs4'):
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f'Entered parser backend ({backend}) is incorrect, '
+                         f'must be one of {list(PARSER_BACKENDS)}.')
+    return PARSER_BACKENDS[backend](content)
@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+from .normalizing import apply_spot_replacements, clean_date_column, parse_date_column
+
+# Columns of a page dataframe, in order
+PAGE_COLUMNS = ['Calendar_Year', 'State', 'School_Period_Type', 'School_Period_Name', 'Start', 'Finish']
+
+# Columns held as categoricals from the moment a page is parsed, as they hold a handful of repeated strings
+PAGE_CATEGORY_COLUMNS = ['State', 'School_Period_Type', 'School_Period_Name']
+
+
+# -------
+# Function definitions
+# -------
+
+# Sets the compact dtypes of a page dataframe in place, categoricals for the repeated strings and a small
+# unsigned int for the year. Also used for pages read from the store and the backup data, so every page
+# has the same dtypes
+def compact_page(df):
+    for column in PAGE_CATEGORY_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+    if 'Calendar_Year' in df.columns:
+        df['Calendar_Year'] = df['Calendar_Year'].astype('uint16')
+    return df
+
+
+# Concatenates dataframes, keeping the categorical columns categorical
+# pd.concat only keeps a categorical if every dataframe has the same categories, otherwise it falls back to
+# object strings, so each is given the sorted union of the categories first. Sorting the categories means
+# sorting by a categorical column gives the same order as sorting the strings
+def concat_pages(dfs, ignore_index=False):
+    dfs = list(dfs)
+    for column in PAGE_CATEGORY_COLUMNS:
+        if not dfs or not all(isinstance(df[column].dtype, pd.CategoricalDtype) for df in dfs
+                              if column in df.columns):
+            continue
+        categories = sorted(set().union(*[df[column].cat.categories for df in dfs if column in df.columns]))
+        dfs = [df.assign(**{column: df[column].cat.set_categories(categories)}) if column in df.columns else df
+               for df in dfs]
+    return pd.concat(dfs, ignore_index=ignore_index)
+
+
+# Each (state, year) page goes through these stages on its own, so a run only needs one state's pages
+# in memory at a time
+
+# Turns the table extracted from a page into a page dataframe, with the rows removed for having NaNs
+# Returns (page dataframe, removed rows dataframe), the page dataframe is what is kept in the store
+def prepare_page(table_data, state, year):
+    # Convert the table data list to a pandas dataframe
+    df = pd.DataFrame(table_data[1:], columns=table_data[0])
+
+    # ----------------------
+    # Processing NaN values
+    # ----------------------
+
+    # create a new DataFrame with rows containing NaN values for use in QA
+    df_na = df[df.isna().any(axis=1)]
+
+    # Removing any completely empty rows
+    df_na = df_na.dropna(how='all')
+
+    # Adding columns to df_na
+    df_na.insert(0, 'State', state)
+    df_na.insert(0, 'Year', year)
+
+    # remove rows containing NaN values from the original DataFrame
+    df = df.dropna()
+
+    # -------------------------------
+    # Data prep for page by page data
+    # -------------------------------
+
+    # Trim all column names
+    df = df.rename(columns=lambda x: x.strip())
+
+    # Drop length column
+    df = df.drop(['Length'], axis=1)
+
+    # Trimming all values in all string columns, a column at a time, every value left is a string
+    df = df.apply(lambda column: column.str.strip())
+
+    # Adding the year to the end of the 'Start' column if it isn't there
+    df['Start'] = df['Start'].where(df['Start'].str.contains(str(year), regex=False), df['Start'] + f" {year}")
+
+    # Add identifier columns
+    df['State'] = state
+    df['Calendar_Year'] = year
+
+    # Renaming Period column to School_Period
+    df = df.rename(columns={'Period': 'School_Period_Name'})
+
+    # Creating a field which describes the term type based on contained text
+    df['School_Period_Type'] = np.select([df['School_Period_Name'].str.contains('Holiday', regex=False),
+                                          df['School_Period_Name'].str.contains('Term', regex=False)],
+                                         ['Holiday', 'Term'], 'Other')
+
+    # Adjusting column order, and switching to compact dtypes
+    df = compact_page(df.reindex(columns=PAGE_COLUMNS))
+
+    return df, df_na
+
+
+# Normalizes a page dataframe, cleaning and parsing its Start and Finish strings to dates
+# Returns (normalized dataframe, dataframe of rows whose dates couldn't be parsed, or None if they all parsed)
+def normalize_page(page_df, drop_terms=True):
+    # Conditionally dropping terms
+    if drop_terms:
+        page_df = page_df[page_df["School_Period_Type"] == "Holiday"]
+
+    # Removing characters to establish consistent formatting, each distinct string is only cleaned once
+    # The other columns aren't copied until the dates are set
+    page_df = page_df.assign(Start=clean_date_column(page_df['Start'], 'Start'),
+                             Finish=clean_date_column(page_df['Finish'], 'Finish'))
+
+    apply_spot_replacements(page_df)
+
+    # Convert dates to date format, each distinct string is only parsed once
+    start_dates = parse_date_column(page_df['Start'])
+    finish_dates = parse_date_column(page_df['Finish'])
+
+    # Rows with dates that couldn't be parsed are returned separately instead of stopping the run
+    failed_parses = (start_dates.isna() | finish_dates.isna()).to_numpy()
+    failed_df = None
+    if failed_parses.any():
+        failed_df = page_df[failed_parses] \
+            .rename(columns={'Calendar_Year': 'Year', 'School_Period_Name': 'Period'}) \
+            .reindex(columns=['Year', 'State', 'Period', 'Start', 'Finish'])
+        failed_df['Reason'] = 'Date could not be parsed'
+
+    # Dates are datetime64 from here on, and only the rows which parsed are kept
+    page_df['Start'] = start_dates
+    page_df['Finish'] = finish_dates
+    if failed_df is not None:
+        page_df = page_df[~failed_parses]
+
+    return page_df, failed_df
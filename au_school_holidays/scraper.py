@@ -0,0 +1,685 @@
+from .states import STATES_LIST, build_url
+from .store import load_store, save_store, load_fingerprints, save_fingerprints, is_final_page
+from .expansion import build_binarydayrows, expand_dayrows
+from .pipeline import prepare_page, normalize_page, concat_pages
+from .changes import CHANGE_COLUMNS, compare_pages, page_fingerprint, table_fingerprint
+from .backup import load_backup_data
+from .writing import OutputWriter, check_output_format, write_output
+from .metrics import RunMetrics
+import pandas as pd
+import datetime
+
+
+# -------
+# Function definition
+# -------
+
+def get_school_dates(start_year,
+                     end_year,
+                     output_folder_target,
+                     output_mode='startfinish',
+                     targets=None,
+                     show_qa_printouts=False,
+                     drop_terms=True,
+                     max_workers=8,
+                     max_per_host=2,
+                     cache=None,
+                     offline=False,
+                     store_folder=None,
+                     parser_backend='bs4',
+                     timeout=30,
+                     max_retries=3,
+                     backoff_factor=1,
+                     backup_data_path=None,
+                     output_format='csv',
+                     partition_by=None,
+                     states_list=None,
+                     qa_verbosity=None,
+                     metrics=None,
+                     run_report_path=None,
+                     keep_outputs=True,
+                     binary_state_mask=False,
+                     binary_state_count=False,
+                     parse_workers=None,
+                     database_path=None):
+    # Sets the default value for the qa_verbosity argument, show_qa_printouts on its own shows everything
+    if qa_verbosity is None:
+        qa_verbosity = 2 if show_qa_printouts else 0
+
+    # Function that prints messages if qa_verbosity is 1 or more
+    def qa_printout(message):
+        if qa_verbosity >= 1:
+            print(message)
+
+    # Function that prints a dataframe if qa_verbosity is 2 or more
+    # The dataframe is only rendered to text when it is shown, with the print options applied just for it
+    def qa_frame(title, df):
+        if qa_verbosity >= 2:
+            with pd.option_context('display.max_rows', None,
+                                   'display.max_columns', None,
+                                   'display.width', 1000,
+                                   'display.colheader_justify', 'center',
+                                   'display.precision', 2):
+                print(f'{title}\n{df}{seperator}')
+
+    # -------
+    # Set-up
+    # -------
+
+    # Sets the default value for the metrics argument, collecting timings and counters for this run
+    if metrics is None:
+        metrics = RunMetrics()
+
+    # Define seperator string
+    seperator = "\n_________________"
+
+    # Sets the default value for the states_list argument, the registry of state sites to scrape
+    if states_list is None:
+        states_list = STATES_LIST
+
+    # Sets the default value for the targets argument
+    if targets is None:
+        targets = ['nsw', 'qld', 'sa', 'vic', 'wa', 'nt', 'act', 'tas']
+
+    # Output modes that can be derived from the scraped data, in the order they are output
+    valid_output_modes = ['startfinish', 'dayrows', 'binarydayrows']
+
+    # Accepting a single mode, a list of modes, or 'all' for every mode
+    if output_mode == 'all':
+        output_modes = valid_output_modes
+    elif isinstance(output_mode, str):
+        output_modes = [output_mode]
+    else:
+        output_modes = list(output_mode)
+
+    # Message for invalid mode arguments, which are then skipped
+    for mode in output_modes:
+        if mode not in valid_output_modes:
+            print(f'Entered output mode ({mode}) is incorrect.')
+    output_modes = [mode for mode in output_modes if mode in valid_output_modes]
+
+    # Checking the output format before anything is fetched, rather than when the first output is written
+    check_output_format(output_format, partition_by)
+
+    # List of (plan position, dict) for storing missing data
+    missing_list = []
+
+    # Lists of (plan position, df) for storing removed rows, and rows with dates that couldn't be parsed
+    removed_rows_list = []
+    failed_rows_list = []
+
+    # Dict of (State, Calendar_Year) to (page dataframe, removed rows dataframe) from previous runs
+    stored_pages = load_store(store_folder) if store_folder is not None else {}
+
+    # Dict of pages scraped in this run, in the same format as stored_pages
+    scraped_pages = {}
+
+    # Dicts of (State, Calendar_Year) to (page fingerprint, table fingerprint), from previous runs and this run
+    # Pages whose fingerprint matches the stored one are taken from the store instead of parsed again
+    stored_fingerprints = load_fingerprints(store_folder) if store_folder is not None else {}
+    scraped_fingerprints = {}
+
+    # List of (plan position, df) of the periods which changed since each page was stored
+    changes_list = []
+
+    # Pages from years before this one are final and are reused from the store instead of scraped again
+    this_year = datetime.date.today().year
+
+    # Recording what the run was asked for in the run report
+    metrics.info.update({'start_year': start_year, 'end_year': end_year, 'targets': list(targets),
+                         'output_modes': output_modes, 'output_format': output_format})
+
+    qa_printout(f'{"_" * 10}\n{"_" * 10}\nState Targets are {targets}{seperator * 2}')
+
+    # -----------------------
+    # Planning pages to fetch
+    # -----------------------
+
+    # List of (state, year, url, missing dict) tuples in the order they will be processed
+    # url is None where the year isn't pulled, missing dict is None where it is
+    page_plan = []
+
+    # Looping over target states
+    for target_state in targets:
+
+        qa_printout(f' {targets}')
+
+        # Looping over years in range
+        for year in range(start_year, end_year + 1):
+
+            qa_printout(f'Year: {year}{seperator * 2}')
+
+            # Checking if requested year is below the minimum
+            if year < states_list[target_state]['min']:
+
+                qa_printout(
+                    f"{target_state.upper()} data not pulled for year {year}, '{states_list[target_state]['url']}"
+                    f"does not have data before {states_list[target_state]['min']}.")
+
+                # Appending dict to the plan as missing data
+                page_plan.append((target_state, year, None, {'Type': 'below minimum available',
+                                                             'Source': 'dict lookup',
+                                                             'Year': year,
+                                                             'State': target_state.upper()}))
+
+                continue
+
+            # Checking if requested year is one of the skip years
+            if year in states_list[target_state]['skipyears']:
+
+                qa_printout(
+                    f"{target_state.upper()} data not pulled for year {year},"
+                    f"{year} is in skipyears: {states_list[target_state]['skipyears']}.")
+
+                # Appending dict to the plan as missing data
+                page_plan.append((target_state, year, None, {'Type': 'Year in skip years',
+                                                             'Source': 'dict lookup',
+                                                             'Year': year,
+                                                             'State': target_state.upper()}))
+
+                continue
+
+            else:
+
+                qa_printout(f'{year} above minimum for {target_state} = True{seperator}')
+
+            # Checking if the page has already been scraped in a previous run and is final
+            if (target_state.upper(), year) in stored_pages and \
+                    is_final_page(stored_pages[(target_state.upper(), year)][0], year, this_year):
+
+                qa_printout(f'{target_state.upper()} data for year {year} taken from the store.{seperator}')
+
+                # Appending to the plan without a url or missing dict, marking it as taken from the store
+                page_plan.append((target_state, year, None, None))
+
+                continue
+
+            # ---------------------
+            # Building URL to scrape
+            # ---------------------
+
+            # Uses the alternate url for the year if there is one, otherwise the default url structure
+            url = build_url(target_state, year, states_list)
+
+            qa_printout(f'URL: {url}{seperator}')
+
+            # Appending the url to the plan to be fetched
+            page_plan.append((target_state, year, url, None))
+
+    # ---------------------------------------
+    # Fetching all planned pages concurrently
+    # ---------------------------------------
+
+    # Offline mode can only serve pages from a cache
+    if offline and cache is None:
+        raise ValueError('offline=True requires a cache to serve pages from.')
+
+    # Mapping of each url to its year, used to pick the cache time to live
+    url_years = {url: year for _, year, url, _ in page_plan if url is not None}
+
+    # The network and parsing libraries are only imported when there are pages to fetch
+    # Runs served entirely from the store and backup data never load them
+    responses = {}
+    if url_years:
+        import requests
+        from .fetching import fetch_pages
+        from .parsing import extract_table
+
+        with metrics.timer('fetch'):
+            responses = fetch_pages(list(url_years),
+                                    max_workers=max_workers,
+                                    max_per_host=max_per_host,
+                                    cache=cache,
+                                    offline=offline,
+                                    url_years=url_years,
+                                    timeout=timeout,
+                                    max_retries=max_retries,
+                                    backoff_factor=backoff_factor,
+                                    metrics=metrics)
+
+    # -------------------------------------------
+    # Fingerprinting pages against the store
+    # -------------------------------------------
+
+    # (State, Calendar_Year) of each url in the plan
+    url_keys = {url: (target_state.upper(), year) for target_state, year, url, _ in page_plan if url is not None}
+
+    # Fingerprint of each page fetched, used to find pages which haven't changed since they were stored
+    page_fingerprints = {url: page_fingerprint(response.content) for url, response in responses.items()
+                         if not isinstance(response, Exception) and response.status_code < 400}
+
+    # Checks if a page's content is the same as when it was stored
+    def is_unchanged_page(url):
+        stored_fingerprint = stored_fingerprints.get(url_keys[url])
+        return url_keys[url] in stored_pages and stored_fingerprint is not None \
+            and stored_fingerprint[0] == page_fingerprints.get(url)
+
+    # ----------------------------------
+    # Page stages, one (state, year) at a time
+    # ----------------------------------
+
+    # Generator yielding the normalized dataframe of each page in a state's part of the plan, in year order
+    # Pages which can't be used are added to the missing data list instead, and pages which haven't changed
+    # since they were stored are taken from the store without being parsed again
+    # Each entry of the missing data and removed rows lists has the page's position in the plan, so they can be
+    # put back in plan order at the end
+    def iter_state_pages(state_plan):
+        for position, target_state, year, url, missing_dict in state_plan:
+
+            # Adding years which weren't pulled to the missing data list
+            if missing_dict is not None:
+                metrics.count('pages_not_pulled')
+                missing_list.append((position, missing_dict))
+                continue
+
+            # Using pages taken from the store, along with their removed rows
+            if url is None:
+                df, df_na = stored_pages[(target_state.upper(), year)]
+                metrics.count('pages_from_store')
+
+            # ------------------------------------------------
+            # Accessing HTML data & getting table as dataframe
+            # ------------------------------------------------
+
+            else:
+                # Try except block to capture 404 errors
+                try:
+                    # Get the response fetched for the URL, re-raising any error from the request
+                    # Each response is only used once, so it is let go of here rather than held for the whole run
+                    response = responses.pop(url)
+                    if isinstance(response, Exception):
+                        raise response
+
+                    # Raise an exception for 404 errors
+                    response.raise_for_status()
+
+                # End point for 404 errors
+                except requests.exceptions.HTTPError as e:
+
+                    qa_printout(f"HTTP error: {e}{seperator}")
+
+                    metrics.count('pages_failed')
+
+                    # Using the status code as the type, e.g. 404, or 504 for pages missing from the cache offline
+                    error_type = str(e.response.status_code) if e.response is not None else '404'
+
+                    # Adding dictionary values to missing data list, with the number of times the request was retried
+                    missing_list.append((position, {'Type': error_type, 'Source': url, 'Year': year,
+                                                    'State': target_state.upper(),
+                                                    'Retries': getattr(e.response, 'retries', 0)}))
+                    continue
+
+                # End point for connection errors and timeouts which carried on through every retry
+                except requests.exceptions.RequestException as e:
+
+                    qa_printout(f"Request error: {e}{seperator}")
+
+                    metrics.count('pages_failed')
+
+                    # Adding dictionary values to missing data list, with the number of times the request was retried
+                    missing_list.append((position, {'Type': 'connection error', 'Source': url, 'Year': year,
+                                                    'State': target_state.upper(),
+                                                    'Retries': getattr(e, 'retries', 0)}))
+                    continue
+
+                key = (target_state.upper(), year)
+
+                # Pages with the same content as when they were stored are taken from the store
+                if is_unchanged_page(url):
+
+                    qa_printout(f'{url} is unchanged since it was stored.{seperator}')
+
+                    df, df_na = stored_pages[key]
+                    scraped_fingerprints[key] = stored_fingerprints[key]
+                    metrics.count('pages_unchanged')
+
+                else:
+                    # Extract the first table on the page as a list of rows with the chosen parser backend
+                    with metrics.timer('parse'):
+                        if url in parsed_tables:
+                            table_data = parsed_tables.pop(url).result()
+                        else:
+                            table_data = extract_table(response.content, backend=parser_backend)
+
+                    # Pages without a table are added to the missing data list
+                    if not table_data:
+
+                        qa_printout(f"No table found on page: {url}{seperator}")
+
+                        metrics.count('pages_without_table')
+                        missing_list.append((position, {'Type': 'no table', 'Source': url, 'Year': year,
+                                                        'State': target_state.upper()}))
+                        continue
+
+                    scraped_fingerprints[key] = (page_fingerprints[url], table_fingerprint(table_data))
+
+                    # Pages where only the rest of the page has changed, and not the table, are also taken from
+                    # the store
+                    if key in stored_pages and stored_fingerprints.get(key, (None, None))[1] == \
+                            scraped_fingerprints[key][1]:
+
+                        qa_printout(f'Table on {url} is unchanged since it was stored.{seperator}')
+
+                        df, df_na = stored_pages[key]
+                        metrics.count('pages_unchanged')
+
+                    else:
+                        # Turning the table into the page dataframe, and the rows with NaNs that were removed
+                        with metrics.timer('clean'):
+                            df, df_na = prepare_page(table_data, target_state.upper(), year)
+
+                        metrics.count('pages_scraped')
+                        metrics.count('rows_dropped_nan', len(df_na))
+
+                        qa_frame('Rows with NaNs that were removed:', df_na)
+                        qa_frame('Final dataframe: ', df)
+
+                        # Comparing the page with the stored one, pages which weren't stored have every period
+                        # added. Terms are left out of the changes when they are dropped from the outputs
+                        if store_folder is not None:
+                            changes_df = compare_pages(stored_pages.get(key, (None,))[0], df)
+                            if drop_terms:
+                                changes_df = changes_df[changes_df['School_Period_Type'] == 'Holiday']
+                            for change, change_count in changes_df['Change'].value_counts().items():
+                                metrics.count(f'periods_{change}', change_count)
+
+                            qa_frame('Changed periods: ', changes_df)
+                            changes_list.append((position, changes_df))
+
+                        # Keeping the page and its removed rows for the store
+                        scraped_pages[key] = (df, df_na)
+
+            # Append the removed rows to removed_rows_list
+            removed_rows_list.append((position, df_na))
+
+            # Cleaning and parsing the page's dates
+            page_df = df
+            with metrics.timer('clean'):
+                df, failed_df = normalize_page(page_df, drop_terms=drop_terms)
+
+            # Upserting the page into the database with its terms, whether or not they are in the outputs
+            # Dates are only cleaned and parsed once per distinct string, so normalizing again is cheap
+            if database is not None:
+                database_df, database_failed_df = (df, failed_df) if not drop_terms \
+                    else normalize_page(page_df, drop_terms=False)
+                database.upsert_page(target_state.upper(), year, database_df,
+                                     pd.concat([df_na, database_failed_df]) if database_failed_df is not None
+                                     else df_na)
+
+            # Rows with dates that couldn't be parsed are added to the removed rows instead of stopping the run
+            if failed_df is not None:
+                metrics.count('rows_failed_date_parse', len(failed_df))
+                qa_frame('Rows with dates that could not be parsed:', failed_df)
+                failed_rows_list.append((position, failed_df))
+
+            yield df
+
+    # ---------------------------------------------------------
+    # State stages, writing each state's rows as they are ready
+    # ---------------------------------------------------------
+
+    # Planned pages by state, with their position in the plan
+    state_plans = {}
+    for position, (target_state, year, url, missing_dict) in enumerate(page_plan):
+        state_plans.setdefault(target_state.upper(), []).append((position, target_state, year, url, missing_dict))
+
+    # Writers for the outputs which are appended to a state at a time
+    # binarydayrows has a column per state, so it is written once every state is done
+    writers = {mode: OutputWriter(output_folder_target,
+                                  f"AU School Hols - Data - {start_year}-{end_year} - {mode}",
+                                  output_format=output_format,
+                                  partition_by=partition_by)
+               for mode in output_modes if mode != 'binarydayrows'}
+
+    # Each state's rows by output mode, kept to return to the caller if keep_outputs = True
+    output_chunks = {mode: [] for mode in output_modes}
+
+    # Each state's periods, used to build binarydayrows once every state is done
+    binary_periods = []
+
+    # Backup data by (Calendar_Year, State), only read from disk the first time or when the file changes
+    with metrics.timer('backup_merge'):
+        backup_index = load_backup_data(backup_data_path)
+
+    # SQLite database the normalized periods of each page are upserted into, if a path was given
+    # Only imported when used, and opened just before the states are looped over so it is always closed
+    database = None
+    if database_path is not None:
+        from .database import HolidayDatabase
+        database = HolidayDatabase(database_path)
+
+    # ------------------------------------------
+    # Parsing pages in worker processes
+    # ------------------------------------------
+
+    # Dict of url to a future of its table data, when pages are parsed in a pool of worker processes
+    # Created just before the states are looped over, so it is always shut down by the finally below
+    # Every page is submitted up front so they are parsed across cores while the states are processed in turn,
+    # and each result is taken by url in plan order, so the output is the same as parsing in this process
+    parse_pool = None
+    parsed_tables = {}
+    if parse_workers is not None and parse_workers > 1 and url_years:
+        from concurrent.futures import ProcessPoolExecutor
+
+        parse_pool = ProcessPoolExecutor(max_workers=parse_workers)
+        for url in page_fingerprints:
+            if not is_unchanged_page(url):
+                parsed_tables[url] = parse_pool.submit(extract_table, responses[url].content, parser_backend)
+
+    # Looping over states in the order they appear in the outputs
+    # Whatever has been written and scraped is kept if a later state fails
+    try:
+        for state, state_plan in sorted(state_plans.items()):
+
+            # Running the state's pages through the page stages
+            missing_before = len(missing_list)
+            state_dfs = list(iter_state_pages(state_plan))
+
+            # -------------------------------------------------
+            # Checking for missing data in Backup Raw Data csv
+            # -------------------------------------------------
+
+            with metrics.timer('backup_merge'):
+
+                # Loop through each dictionary added to missing_list for this state
+                for _, missing_dict in missing_list[missing_before:]:
+
+                    # Extract the Year and State values from the current dictionary
+                    year_value = missing_dict['Year']
+                    state_value = missing_dict['State']
+
+                    # Look up the rows in the backup data that match the missing Year and State values
+                    filtered_data = backup_index.get((year_value, state_value))
+
+                    # Check if any rows were found
+                    # If they were, add them to the state's dataframes & and add a key to the missing_list dict
+                    if filtered_data is not None:
+
+                        # Add the filtered data to the state's dataframes
+                        state_dfs.append(filtered_data)
+                        metrics.count('pages_from_backup')
+
+                        # Adding it to the database, where it doesn't replace any scraped data
+                        if database is not None:
+                            database.upsert_page(state_value, year_value, filtered_data, source='backup')
+
+                        # Add a new entry to the current dictionary for Backup Status
+                        missing_dict['Backup Status'] = 'Data taken from backup'
+
+                        qa_printout(f'Missing Data for Year: {year_value} & State {state_value} '
+                                    f'found in Backup Raw Data and added to results')
+                    # If no data was found, add key to dict in missing_list and do a qa printout
+                    else:
+
+                        missing_dict['Backup Status'] = 'Data not found in backup'
+
+                        qa_printout(f'Missing Data for Year: {year_value} & State {state_value} '
+                                    f'was not found in the backup data source')
+
+            # States with no data at all have nothing to write
+            if not state_dfs:
+                continue
+
+            # Combining the state's dataframes and sorting them, keeping the categorical columns
+            with metrics.timer('combine'):
+                state_df = concat_pages(state_dfs).sort_values(["State", "Start"]).reset_index()
+
+            # -----------------------------------------------
+            # Date transformation conditional on output_modes
+            # -----------------------------------------------
+
+            # Dict of output mode to the state's dataframe for it
+            state_outputs = {}
+
+            # Dates are shown with start and finish columns
+            if "startfinish" in output_modes:
+                state_outputs["startfinish"] = state_df
+
+            # Splitting data to have one unique date and state per row
+            if "dayrows" in output_modes:
+
+                # Expand each period to one row per date, built in a single allocation
+                with metrics.timer('expansion'):
+                    dayrows_df = expand_dayrows(state_df)
+
+                    # Sorting the dataframe
+                    state_outputs["dayrows"] = dayrows_df.sort_values(["State", "Date"])
+
+            # Keeping the state's periods, which is all binarydayrows needs from the state
+            if "binarydayrows" in output_modes:
+                binary_periods.append(state_df[['Calendar_Year', 'State', 'School_Period_Type', 'Start', 'Finish']])
+
+            # Appending the state's rows to each output, flushed to disk before moving on
+            for mode, output_df in state_outputs.items():
+
+                qa_frame(f'Final dataframe ({mode}) for {state}: ', output_df)
+
+                metrics.count(f'rows_{mode}', len(output_df))
+
+                with metrics.timer('write'):
+                    writers[mode].write(output_df)
+
+                if keep_outputs:
+                    output_chunks[mode].append(output_df)
+
+    # Closing the writers and merging newly scraped pages into the store, even if the run stopped part way
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+        if parse_pool is not None:
+            parse_pool.shutdown(cancel_futures=True)
+
+        if database is not None:
+            database.upsert_missing([missing_dict for _, missing_dict in missing_list])
+            database.close()
+
+        if store_folder is not None:
+            save_store(store_folder, {**stored_pages, **scraped_pages})
+            save_fingerprints(store_folder, {**stored_fingerprints, **scraped_fingerprints})
+
+    # ------------------------------------------
+    # binarydayrows, from every state's periods
+    # ------------------------------------------
+
+    # Groups data by date and represents states as columns with 1s and 0s
+    if "binarydayrows" in output_modes and binary_periods:
+
+        # Built straight from the periods' start and finish dates, without expanding them to day rows
+        with metrics.timer('pivot'):
+            binarydayrows_df = build_binarydayrows(concat_pages(binary_periods),
+                                                   state_mask=binary_state_mask,
+                                                   state_count=binary_state_count)
+
+        qa_frame('Final dataframe (binarydayrows): ', binarydayrows_df)
+
+        metrics.count('rows_binarydayrows', len(binarydayrows_df))
+
+        # Saving the output to the specified folder in the chosen format
+        with metrics.timer('write'):
+            write_output(binarydayrows_df,
+                         output_folder_target,
+                         f"AU School Hols - Data - {start_year}-{end_year} - binarydayrows",
+                         output_format=output_format,
+                         partition_by=partition_by)
+
+        if keep_outputs:
+            output_chunks["binarydayrows"].append(binarydayrows_df)
+
+    # Dict of output mode to the dataframe output for it, in the order of the output modes
+    output_dfs = {mode: concat_pages(chunks, ignore_index=True) for mode, chunks in output_chunks.items() if chunks}
+
+    # -----------------------------
+    # Outputting df of missing data
+    # -----------------------------
+
+    # Converting error list to dataframe, in plan order
+    df_missing = pd.DataFrame([missing_dict for _, missing_dict in sorted(missing_list, key=lambda item: item[0])])
+
+    # Keeping retry counts as whole numbers, they are blank for years that weren't fetched
+    if 'Retries' in df_missing.columns:
+        df_missing['Retries'] = df_missing['Retries'].astype('Int64')
+
+    qa_frame('Missing data: ', df_missing)
+
+    # Outputting df_missing to specified folder
+    with metrics.timer('write'):
+        write_output(df_missing,
+                     output_folder_target,
+                     f"AU School Hols - Missing Data - {start_year}-{end_year}",
+                     output_format=output_format)
+
+    # -----------------------------
+    # Outputting df of removed rows
+    # -----------------------------
+
+    # Combining the many rows dfs in plan order, with rows that couldn't be parsed last
+    removed_rows_dfs = [df for _, df in sorted(removed_rows_list, key=lambda item: item[0])] \
+        + [df for _, df in sorted(failed_rows_list, key=lambda item: item[0])]
+    all_removed_rows_df = pd.concat(removed_rows_dfs) if removed_rows_dfs else pd.DataFrame(columns=['Year', 'State'])
+
+    qa_frame('Removed rows: ', all_removed_rows_df)
+
+    # Outputting all_removed_rows_df to specified folder
+    with metrics.timer('write'):
+        write_output(all_removed_rows_df,
+                     output_folder_target,
+                     f"AU School Hols - Removed Rows - {start_year}-{end_year}",
+                     output_format=output_format)
+
+    # ------------------------------
+    # Outputting df of changes
+    # ------------------------------
+
+    # Periods which were added, removed, finalized or changed since each page was stored, in plan order
+    # Only output when there is a store to compare against
+    if store_folder is not None:
+        changes_dfs = [df for _, df in sorted(changes_list, key=lambda item: item[0])]
+        all_changes_df = pd.concat(changes_dfs, ignore_index=True) if changes_dfs \
+            else pd.DataFrame(columns=CHANGE_COLUMNS)
+
+        qa_frame('Changes: ', all_changes_df)
+
+        # Outputting all_changes_df to specified folder
+        with metrics.timer('write'):
+            write_output(all_changes_df,
+                         output_folder_target,
+                         f"AU School Hols - Changes - {start_year}-{end_year}",
+                         output_format=output_format)
+
+    # -----------------------------
+    # Outputting the run report
+    # -----------------------------
+
+    # Timings and counters for the run, as json, if a path was given
+    if run_report_path is not None:
+        metrics.write_report(run_report_path)
+
+    qa_printout(f'Stage timings (seconds): {metrics.timings}\nCounters: {metrics.counters}{seperator}')
+
+    # Returning the output dataframes by mode for use by the caller
+    return output_dfs
+
+    # --------------------
+    # End of function
+    # --------------------
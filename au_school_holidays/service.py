@@ -0,0 +1,296 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import argparse
+import datetime
+import json
+import pathlib
+import threading
+import pandas as pd
+from .scraper import get_school_dates
+from .cache import ResponseCache
+from .lookup import HolidayIndex
+
+# Columns of the table held by the service, the startfinish output without its index column
+TABLE_COLUMNS = ['Calendar_Year', 'State', 'School_Period_Type', 'School_Period_Name', 'Start', 'Finish']
+
+# Default seconds between background refreshes of the current and next year
+DEFAULT_REFRESH_INTERVAL = 6 * 60 * 60
+
+
+# -------
+# Class definitions
+# -------
+
+# A loaded copy of the holiday table and the index built from it, never changed once built
+# The service swaps in a whole new snapshot on refresh, so each request works from one consistent snapshot
+class HolidaySnapshot:
+
+    def __init__(self, periods_df, version):
+        self.periods_df = periods_df
+        self.index = HolidayIndex(periods_df)
+        self.version = version
+        self.loaded_at = datetime.datetime.now().isoformat(timespec='seconds')
+
+
+# Holds the holiday table for a range of years in memory, refreshing the current and next year in the background
+# Pages, the store and the outputs of each scrape are kept in folder, so restarts only scrape what isn't stored
+class HolidayService:
+
+    def __init__(self,
+                 start_year,
+                 end_year,
+                 folder,
+                 refresh_interval=DEFAULT_REFRESH_INTERVAL,
+                 **scrape_kwargs):
+        self.start_year = start_year
+        self.end_year = end_year
+        self.folder = pathlib.Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.refresh_interval = refresh_interval
+
+        # Arguments passed through to get_school_dates, with a page cache in the folder unless one is given
+        self.scrape_kwargs = {'cache': ResponseCache(self.folder / 'HTTP Cache'), 'qa_verbosity': 0, **scrape_kwargs}
+
+        self.snapshot = None
+        self.last_refresh = None
+        self.last_error = None
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # Scrapes a range of years, returning the startfinish table
+    def _scrape(self, start_year, end_year):
+        output_dfs = get_school_dates(start_year,
+                                      end_year,
+                                      self.folder,
+                                      output_mode='startfinish',
+                                      store_folder=self.folder,
+                                      **self.scrape_kwargs,
+                                      keep_outputs=True)
+        if 'startfinish' not in output_dfs:
+            return pd.DataFrame(columns=TABLE_COLUMNS)
+        return output_dfs['startfinish'].reindex(columns=TABLE_COLUMNS)
+
+    # Loads the whole range the first time, then re-scrapes only the current and next year
+    # The new snapshot is built to the side and swapped in with a single assignment, so requests being served
+    # keep using the snapshot they started with. Returns False if a refresh was already running
+    def refresh(self):
+        if not self._refresh_lock.acquire(blocking=False):
+            return False
+        try:
+            current_snapshot = self.snapshot
+            if current_snapshot is None:
+                periods_df = self._scrape(self.start_year, self.end_year)
+            else:
+                this_year = datetime.date.today().year
+                refresh_start = max(this_year, self.start_year)
+                refresh_end = min(this_year + 1, self.end_year)
+                if refresh_start > refresh_end:
+                    return True
+                refreshed_df = self._scrape(refresh_start, refresh_end)
+
+                # Replacing each (State, Calendar_Year) which came back, pages which couldn't be scraped this
+                # time keep the rows they had
+                old_df = current_snapshot.periods_df
+                refreshed_keys = pd.MultiIndex.from_frame(refreshed_df[['State', 'Calendar_Year']])
+                kept = ~pd.MultiIndex.from_frame(old_df[['State', 'Calendar_Year']]).isin(refreshed_keys)
+                periods_df = pd.concat([old_df[kept], refreshed_df])
+
+            periods_df = periods_df.sort_values(['State', 'Start']).reset_index(drop=True)
+            version = 1 if current_snapshot is None else current_snapshot.version + 1
+            self.snapshot = HolidaySnapshot(periods_df, version)
+            self.last_error = None
+            return True
+
+        # Keeping the current snapshot if the scrape fails, the error is shown in the status
+        except Exception as e:
+            self.last_error = f'{type(e).__name__}: {e}'
+            return True
+        finally:
+            self.last_refresh = datetime.datetime.now().isoformat(timespec='seconds')
+            self._refresh_lock.release()
+
+    # Starts a refresh in a background thread, returning straight away
+    def refresh_in_background(self):
+        threading.Thread(target=self.refresh, daemon=True).start()
+
+    # Background loop, loading straight away and then refreshing every refresh_interval seconds
+    def _run(self):
+        self.refresh()
+        while not self._stop.wait(self.refresh_interval):
+            self.refresh()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    # Current state of the service, as a json serialisable dict
+    def status(self):
+        snapshot = self.snapshot
+        return {'loaded': snapshot is not None,
+                'version': snapshot.version if snapshot is not None else None,
+                'loaded_at': snapshot.loaded_at if snapshot is not None else None,
+                'rows': len(snapshot.periods_df) if snapshot is not None else 0,
+                'start_year': self.start_year,
+                'end_year': self.end_year,
+                'refreshing': self._refresh_lock.locked(),
+                'last_refresh': self.last_refresh,
+                'last_error': self.last_error}
+
+
+# Answers json requests from the service's current snapshot
+# GET  /status                                          - the state of the service
+# GET  /lookup?date=2025-07-10&state=nsw                - whether dates are holidays, date and state can be repeated
+# GET  /periods?start=2025-01-01&finish=2025-12-31      - periods overlapping a range, optionally for a state,
+#                                                         as json or csv with format=csv
+# GET  /holiday-days?start=2025-01-01&finish=2025-12-31 - number of holiday days per state in a range
+# POST /refresh                                         - starts a refresh in the background
+class _ServiceHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        params = parse_qs(parsed.query)
+        service = self.server.service
+
+        if parsed.path == '/status':
+            self._send_json(200, service.status())
+            return
+
+        routes = {'/lookup': self._lookup, '/periods': self._periods, '/holiday-days': self._holiday_days}
+        if parsed.path not in routes:
+            self._send_json(404, {'error': f'Unknown path {parsed.path}'})
+            return
+
+        # Every request uses the snapshot as it was when the request started
+        snapshot = service.snapshot
+        if snapshot is None:
+            self._send_json(503, {'error': 'Holiday data is still loading'})
+            return
+
+        try:
+            routes[parsed.path](snapshot, params)
+        except (KeyError, ValueError) as e:
+            self._send_json(400, {'error': f'Bad request: {e}'})
+
+    def do_POST(self):
+        if urlparse(self.path).path != '/refresh':
+            self._send_json(404, {'error': f'Unknown path {self.path}'})
+            return
+        self.server.service.refresh_in_background()
+        self._send_json(202, {'refreshing': True})
+
+    def _lookup(self, snapshot, params):
+        dates = params['date']
+        states = params['state']
+
+        # A single state applies to every date
+        if len(states) == 1:
+            states = states * len(dates)
+        if len(states) != len(dates):
+            raise ValueError('date and state must be given the same number of times, or state once')
+
+        results_df = snapshot.index.lookup(dates, states)
+        results = [{'date': date.date().isoformat(),
+                    'state': state,
+                    'is_holiday': bool(is_holiday),
+                    'period_name': name if isinstance(name, str) else None,
+                    'period_type': period_type if isinstance(period_type, str) else None}
+                   for date, state, is_holiday, name, period_type
+                   in results_df.itertuples(index=False, name=None)]
+        self._send_json(200, {'version': snapshot.version, 'results': results})
+
+    def _periods(self, snapshot, params):
+        start = pd.Timestamp(params['start'][0])
+        finish = pd.Timestamp(params['finish'][0])
+        periods_df = snapshot.periods_df
+        overlaps = (periods_df['Start'] <= finish) & (periods_df['Finish'] >= start)
+        if 'state' in params:
+            overlaps &= periods_df['State'].isin([state.upper() for state in params['state']])
+        if 'type' in params:
+            overlaps &= periods_df['School_Period_Type'].isin(params['type'])
+        periods_df = periods_df[overlaps]
+
+        if params.get('format', ['json'])[0] == 'csv':
+            self._send(200, periods_df.to_csv(index=False, date_format='%Y-%m-%d').encode(), 'text/csv')
+            return
+
+        periods_df = periods_df.assign(Start=periods_df['Start'].dt.strftime('%Y-%m-%d'),
+                                       Finish=periods_df['Finish'].dt.strftime('%Y-%m-%d'))
+        self._send_json(200, {'version': snapshot.version, 'periods': periods_df.to_dict(orient='records')})
+
+    def _holiday_days(self, snapshot, params):
+        holiday_days = snapshot.index.holiday_days(params['start'][0], params['finish'][0], params.get('state'))
+        self._send_json(200, {'version': snapshot.version, 'holiday_days': holiday_days.to_dict()})
+
+    def _send_json(self, status, body):
+        self._send(status, json.dumps(body).encode(), 'application/json')
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    # Only logging errors, not every request
+    def log_message(self, format, *args):
+        pass
+
+
+# Local http server for a HolidayService, each request is handled on its own thread
+class HolidayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, service, host='127.0.0.1', port=8765):
+        super().__init__((host, port), _ServiceHandler)
+        self.service = service
+
+
+# -------
+# Function definitions
+# -------
+
+# Runs the service from the command line until it is interrupted
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='au-school-holidays-service',
+                                     description='Serve school holiday dates over http, refreshing them in the '
+                                                 'background.')
+    parser.add_argument('start_year', type=int, help='First calendar year to hold dates for.')
+    parser.add_argument('end_year', type=int, help='Last calendar year to hold dates for (inclusive).')
+    parser.add_argument('--folder', default='Service Data',
+                        help='Folder for the page cache, store and outputs (default: Service Data).')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1).')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on (default: 8765).')
+    parser.add_argument('--refresh-hours', type=float, default=DEFAULT_REFRESH_INTERVAL / 3600,
+                        help='Hours between refreshes of the current and next year (default: 6).')
+    parser.add_argument('--keep-terms', dest='drop_terms', action='store_false',
+                        help='Hold the school term rows as well as the holidays.')
+    args = parser.parse_args(argv)
+
+    holiday_service = HolidayService(args.start_year,
+                                     args.end_year,
+                                     args.folder,
+                                     refresh_interval=args.refresh_hours * 3600,
+                                     drop_terms=args.drop_terms)
+    holiday_service.start()
+
+    server = HolidayServer(holiday_service, host=args.host, port=args.port)
+    print(f'Serving school holiday dates on http://{args.host}:{server.server_address[1]}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        holiday_service.stop()
+        server.server_close()
+
+
+# --------------------
+# Running the service
+# --------------------
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+from urllib.parse import urljoin
+
+# List of states, with url information and alternate url structures
+STATES_LIST = {'nsw':
+                   {'url': 'https://www.nswschoolholiday.com.au/index.php/',
+                    'subdir': 'nsw-school-holiday-dates-',
+                    'min': 2015,
+                    'skipyears': [2026],
+                    'altyears': {}
+                    },
+               'qld':
+                   {'url': 'https://www.qldschoolholiday.com.au/',
+                    'subdir': 'queensland-school-holiday-dates-',
+                    'min': 2014,
+                    'skipyears': [2026],
+                    'altyears':
+                        {2014: 'https://www.qldschoolholiday.com.au/qld-school-holiday-dates-2014/',
+                         2015: 'https://www.qldschoolholiday.com.au/qld-school-holiday-dates-2015/',
+                         2016: 'https://www.qldschoolholiday.com.au/qld-school-holiday-dates-2016/'}
+                    },
+               'sa':
+                   {'url': 'https://www.schoolholidayssa.com.au/',
+                    'subdir': 'sa-school-holiday-dates-',
+                    'min': 2015,
+                    'skipyears': [2026],
+                    'altyears': {}
+                    },
+               'vic':
+                   {'url': 'https://www.victoriaschoolholidays.com.au/',
+                    'subdir': 'vic-school-holiday-dates-',
+                    'min': 2014,
+                    'skipyears': [2026],
+                    'altyears':
+                        {2014: 'https://www.victoriaschoolholidays.com.au/2014-term-dates',
+                         2015: 'https://www.victoriaschoolholidays.com.au/2015-term-dates',
+                         2016: 'https://www.victoriaschoolholidays.com.au/2016-term-dates'}
+                    },
+               'wa':
+                   {'url': 'https://www.schoolholidayswa.com.au/',
+                    'subdir': 'wa-school-holiday-dates-',
+                    'min': 2015,
+                    'skipyears': [2026],
+                    'altyears': {}
+                    },
+               'nt':
+                   {'url': 'https://www.ntschoolholidays.com.au/',
+                    'subdir': 'nt-school-holiday-dates-',
+                    'min': 2018,
+                    'skipyears': [2026],
+                    'altyears': {}
+                    },
+               'act':
+                   {'url': 'https://www.actschoolholidays.com.au/',
+                    'subdir': 'act-school-holiday-dates-',
+                    'min': 2018,
+                    'skipyears': [2026],
+                    'altyears': {}
+                    },
+               'tas':
+                   {'url': 'https://tasmanianschoolholidays.com.au/',
+                    'subdir': 'tasmanian-school-holiday-dates-',
+                    'min': 2018,
+                    'skipyears': [2026],
+                    'altyears': {2018: 'https://tasmanianschoolholidays.com.au/tas-school-holiday-dates-2018',
+                                 2019: 'https://tasmanianschoolholidays.com.au/tas-school-holiday-dates-2019',
+                                 2020: 'https://tasmanianschoolholidays.com.au/tas-school-holiday-dates-2020',
+                                 2021: 'https://tasmanianschoolholidays.com.au/tas-school-holiday-dates-2021'}
+                    }
+               }
+
+
+# -------
+# Function definition
+# -------
+
+# Builds the url of the page for a state and year, using the alternate url for the year if it has one
+def build_url(target_state, year, states_list=None):
+    # Sets the default value for the states_list argument
+    if states_list is None:
+        states_list = STATES_LIST
+
+    # Checks for alternate URL types by year
+    if year in states_list[target_state]['altyears']:
+        return states_list[target_state]['altyears'][year]
+
+    # Otherwise uses the default url structure
+    return urljoin(states_list[target_state]['url'], states_list[target_state]['subdir'] + str(year))
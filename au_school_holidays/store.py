@@ -0,0 +1,102 @@
+import pandas as pd
+import pathlib
+from .pipeline import compact_page
+from .changes import has_provisional_dates
+
+# File names of the store, which holds the page by page data from previous runs
+STORE_PAGES_FILENAME = 'AU School Hols - Store - Pages.csv'
+STORE_REMOVED_ROWS_FILENAME = 'AU School Hols - Store - Removed Rows.csv'
+
+# File name of the fingerprints of the stored pages, used to tell if a page has changed since it was stored
+STORE_FINGERPRINTS_FILENAME = 'AU School Hols - Store - Fingerprints.csv'
+
+
+# -------
+# Function definitions
+# -------
+
+# Loads the store as a dict of (State, Calendar_Year) to (page dataframe, removed rows dataframe)
+def load_store(store_folder):
+    pages_path = pathlib.Path(store_folder) / STORE_PAGES_FILENAME
+    removed_rows_path = pathlib.Path(store_folder) / STORE_REMOVED_ROWS_FILENAME
+
+    # Nothing stored yet
+    if not pages_path.exists():
+        return {}
+
+    # Reading the page data, keeping the index each row had on its page
+    pages_df = pd.read_csv(pages_path, index_col='Page_Index', dtype=str, keep_default_na=False)
+    pages_df.index = pages_df.index.astype(int)
+    pages_df.index.name = None
+    compact_page(pages_df)
+
+    # Reading the removed rows, if there are any
+    if removed_rows_path.exists():
+        removed_rows_df = pd.read_csv(removed_rows_path, dtype=str)
+        removed_rows_df['Year'] = removed_rows_df['Year'].astype(int)
+    else:
+        removed_rows_df = pd.DataFrame(columns=['Year', 'State'])
+
+    # Splitting the removed rows by state and year
+    removed_rows_by_page = {key: group for key, group in removed_rows_df.groupby(['State', 'Year'])}
+
+    # Splitting the page data by state and year, pairing each page with its removed rows
+    store = {}
+    for (state, year), page_df in pages_df.groupby(['State', 'Calendar_Year'], observed=True):
+        key = (state, int(year))
+        store[key] = (page_df, removed_rows_by_page.get(key, removed_rows_df.iloc[0:0]))
+
+    return store
+
+
+# Checks whether a stored page is final, so can be reused instead of scraped again
+# Pages from before last year are final, pages from last year only once none of their dates are TBC, since
+# sites confirm the dates of the last year's final periods into the new year
+def is_final_page(page_df, year, this_year):
+    if year < this_year - 1:
+        return True
+    return year < this_year and not has_provisional_dates(page_df)
+
+
+# Saves a dict of (State, Calendar_Year) to (page dataframe, removed rows dataframe) as the store
+def save_store(store_folder, store):
+    pages_path = pathlib.Path(store_folder) / STORE_PAGES_FILENAME
+    removed_rows_path = pathlib.Path(store_folder) / STORE_REMOVED_ROWS_FILENAME
+
+    # Nothing to save
+    if not store:
+        return
+
+    pathlib.Path(store_folder).mkdir(parents=True, exist_ok=True)
+
+    # Combining the pages in state then year order
+    keys = sorted(store)
+    pages_df = pd.concat([store[key][0] for key in keys])
+    removed_rows_df = pd.concat([store[key][1] for key in keys])
+
+    pages_df.to_csv(pages_path, index_label='Page_Index')
+    removed_rows_df.to_csv(removed_rows_path, index=False)
+
+
+# Loads the fingerprints of stored pages as a dict of (State, Calendar_Year) to (page fingerprint, table fingerprint)
+def load_fingerprints(store_folder):
+    fingerprints_path = pathlib.Path(store_folder) / STORE_FINGERPRINTS_FILENAME
+    if not fingerprints_path.exists():
+        return {}
+    fingerprints_df = pd.read_csv(fingerprints_path, dtype={'State': str, 'Calendar_Year': int,
+                                                           'Page_Fingerprint': str, 'Table_Fingerprint': str})
+    return {(state, year): (page_fingerprint, table_fingerprint)
+            for state, year, page_fingerprint, table_fingerprint
+            in fingerprints_df.itertuples(index=False, name=None)}
+
+
+# Saves a dict of (State, Calendar_Year) to (page fingerprint, table fingerprint) with the store
+def save_fingerprints(store_folder, fingerprints):
+    fingerprints_path = pathlib.Path(store_folder) / STORE_FINGERPRINTS_FILENAME
+    if not fingerprints:
+        return
+    pathlib.Path(store_folder).mkdir(parents=True, exist_ok=True)
+    pd.DataFrame([(state, year, page_fingerprint, table_fingerprint)
+                  for (state, year), (page_fingerprint, table_fingerprint) in sorted(fingerprints.items())],
+                 columns=['State', 'Calendar_Year', 'Page_Fingerprint', 'Table_Fingerprint']) \
+        .to_csv(fingerprints_path, index=False)
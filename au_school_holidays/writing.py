@@ -0,0 +1,213 @@
+import importlib.util
+import pathlib
+import shutil
+import pandas as pd
+
+# Output formats and the file extension used for each
+OUTPUT_FORMATS = {'csv': '.csv',
+                  'parquet': '.parquet',
+                  'feather': '.feather'}
+
+# Columns stored as categoricals in the columnar formats, as they hold a handful of repeated strings
+CATEGORY_COLUMNS = ['State', 'School_Period_Type', 'School_Period_Name', 'Type', 'Backup Status']
+
+# Year columns, which fit in a small unsigned int
+YEAR_COLUMNS = ['Calendar_Year', 'Year']
+
+# Date columns, stored as dates without a time in the columnar formats
+DATE_COLUMNS = ['Start', 'Finish', 'Date']
+
+# State columns of the binarydayrows output, which only hold 1s and 0s
+STATE_COLUMNS = ['NSW', 'QLD', 'SA', 'VIC', 'WA', 'NT', 'ACT', 'TAS']
+
+
+# -------
+# Function definitions
+# -------
+
+# Checks an output format is known, and that pyarrow is installed if the format or partitioning needs it
+# Called before a run starts, so a bad format fails straight away rather than once the pages are scraped
+def check_output_format(output_format, partition_by=None):
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f'Entered output format ({output_format}) is incorrect, '
+                         f'must be one of {list(OUTPUT_FORMATS)}.')
+    if (output_format != 'csv' or partition_by) and importlib.util.find_spec('pyarrow') is None:
+        needed_for = f'the {output_format} output format' if output_format != 'csv' else 'partition_by'
+        raise ImportError(f'pyarrow is required for {needed_for}, install it with pip install pyarrow.')
+
+
+# Returns a copy of a dataframe with compact dtypes for each of the known columns
+def compact_dtypes(df):
+    df = df.copy()
+    for column in df.columns:
+        if column in CATEGORY_COLUMNS:
+            df[column] = df[column].astype('category')
+        elif column in YEAR_COLUMNS and pd.api.types.is_integer_dtype(df[column]):
+            df[column] = df[column].astype('uint16')
+        elif column in DATE_COLUMNS and pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = df[column].astype('datetime64[s]')
+        elif column in STATE_COLUMNS and pd.api.types.is_integer_dtype(df[column]):
+            df[column] = df[column].astype('uint8')
+    return df
+
+
+# Converts a dataframe to an arrow table, storing date columns as date32
+def _to_arrow_table(df):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for position, field in enumerate(table.schema):
+        if field.name in DATE_COLUMNS and pa.types.is_timestamp(field.type):
+            table = table.set_column(position, field.name, table.column(position).cast(pa.date32()))
+    return table
+
+
+# Writes a dataframe to the output folder as file_stem plus the format's extension
+# If partition_by is given, a folder named file_stem is written instead, split into hive style
+# sub folders like State=NSW/Calendar_Year=2025 for each of those columns the dataframe has
+# Returns the path written to
+def write_output(df, output_folder_target, file_stem, output_format='csv', partition_by=None):
+    check_output_format(output_format, partition_by)
+
+    # Only partitioning on the columns this dataframe has
+    partition_columns = [column for column in (partition_by or []) if column in df.columns]
+
+    # Unpartitioned csv keeps the dataframe's dtypes as they are
+    if output_format == 'csv' and not partition_columns:
+        output_path = pathlib.Path(output_folder_target) / (file_stem + OUTPUT_FORMATS['csv'])
+        df.to_csv(output_path, index=False)
+        return output_path
+
+    # The columnar formats and partitioning are written through pyarrow, which is an optional dependency
+    import pyarrow.dataset
+    import pyarrow.feather
+    import pyarrow.parquet
+
+    table = _to_arrow_table(compact_dtypes(df) if output_format != 'csv' else df)
+
+    if partition_columns:
+        output_path = pathlib.Path(output_folder_target) / file_stem
+        pyarrow.dataset.write_dataset(table,
+                                      output_path,
+                                      format='ipc' if output_format == 'feather' else output_format,
+                                      partitioning=partition_columns,
+                                      partitioning_flavor='hive',
+                                      existing_data_behavior='delete_matching')
+        return output_path
+
+    output_path = pathlib.Path(output_folder_target) / (file_stem + OUTPUT_FORMATS[output_format])
+    if output_format == 'parquet':
+        pyarrow.parquet.write_table(table, output_path)
+    else:
+        pyarrow.feather.write_feather(table, output_path)
+    return output_path
+
+
+# -------
+# Class definition
+# -------
+
+# Writes an output in chunks, e.g. one state at a time, to the same path write_output would use
+# Each chunk is on disk once write returns, so the chunks written before a failure part way through a run are kept
+# Chunks are written with the columns of the first chunk, in the same order
+class OutputWriter:
+
+    def __init__(self, output_folder_target, file_stem, output_format='csv', partition_by=None):
+        check_output_format(output_format, partition_by)
+        self.output_folder_target = output_folder_target
+        self.file_stem = file_stem
+        self.output_format = output_format
+        self.partition_by = partition_by
+        self.output_path = None
+        self._columns = None
+        self._categories = {}
+        self._schema = None
+        self._writer = None
+        self._chunks_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # Keeps the categories of each categorical column growing from chunk to chunk, so the dictionaries
+    # written to columnar files only ever have values added to them
+    def _extend_categories(self, df):
+        for column in df.columns:
+            if isinstance(df[column].dtype, pd.CategoricalDtype):
+                known = self._categories.setdefault(column, [])
+                known.extend(category for category in df[column].cat.categories if category not in known)
+                df[column] = df[column].cat.set_categories(known)
+        return df
+
+    # Converts a chunk to an arrow table with the same schema as the first chunk
+    # Dictionary indices are widened to int32 so later chunks can add categories without changing the schema
+    def _to_arrow_chunk(self, df):
+        import pyarrow as pa
+
+        table = _to_arrow_table(self._extend_categories(compact_dtypes(df)) if self.output_format != 'csv' else df)
+        if self._schema is None:
+            self._schema = pa.schema([field.with_type(pa.dictionary(pa.int32(), field.type.value_type))
+                                      if pa.types.is_dictionary(field.type) else field
+                                      for field in table.schema], metadata=table.schema.metadata)
+        return table.cast(self._schema)
+
+    # Writes a chunk of the output
+    def write(self, df):
+        if self._columns is None:
+            self._columns = list(df.columns)
+        df = df.reindex(columns=self._columns)
+
+        # Only partitioning on the columns this output has
+        partition_columns = [column for column in (self.partition_by or []) if column in self._columns]
+
+        # Unpartitioned csv is appended to, with the header written with the first chunk
+        if self.output_format == 'csv' and not partition_columns:
+            self.output_path = pathlib.Path(self.output_folder_target) / (self.file_stem + OUTPUT_FORMATS['csv'])
+            df.to_csv(self.output_path, index=False, mode='w' if self._chunks_written == 0 else 'a',
+                      header=self._chunks_written == 0)
+            self._chunks_written += 1
+            return
+
+        # The columnar formats and partitioning are written through pyarrow, which is an optional dependency
+        import pyarrow as pa
+        import pyarrow.dataset
+        import pyarrow.parquet
+
+        table = self._to_arrow_chunk(df)
+
+        # Partitioned outputs write each chunk as its own files, after clearing out any previous run's folder
+        if partition_columns:
+            self.output_path = pathlib.Path(self.output_folder_target) / self.file_stem
+            if self._chunks_written == 0 and self.output_path.is_dir():
+                shutil.rmtree(self.output_path)
+            extension = OUTPUT_FORMATS[self.output_format].lstrip('.')
+            pyarrow.dataset.write_dataset(table,
+                                          self.output_path,
+                                          format='ipc' if self.output_format == 'feather' else self.output_format,
+                                          partitioning=partition_columns,
+                                          partitioning_flavor='hive',
+                                          basename_template=f'part-{self._chunks_written}-{{i}}.{extension}',
+                                          existing_data_behavior='overwrite_or_ignore')
+            self._chunks_written += 1
+            return
+
+        # Unpartitioned parquet is written a row group per chunk, and feather a record batch per chunk
+        extension = OUTPUT_FORMATS[self.output_format]
+        self.output_path = pathlib.Path(self.output_folder_target) / (self.file_stem + extension)
+        if self._writer is None:
+            if self.output_format == 'parquet':
+                self._writer = pyarrow.parquet.ParquetWriter(self.output_path, self._schema)
+            else:
+                self._writer = pa.ipc.new_file(self.output_path, self._schema,
+                                               options=pa.ipc.IpcWriteOptions(compression='lz4',
+                                                                               emit_dictionary_deltas=True))
+        self._writer.write_table(table)
+        self._chunks_written += 1
+
+    # Finishes the file, columnar files are only complete once their footer has been written here
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
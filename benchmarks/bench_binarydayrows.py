@@ -0,0 +1,50 @@
+import pathlib
+import sys
+import pandas as pd
+
+# Making the au_school_holidays package importable when run as a script
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.resolve()))
+
+from bench_dayrows import synthetic_combo_df
+from au_school_holidays.expansion import build_binarydayrows, expand_dayrows
+from measuring import measure
+
+
+# -------
+# Function definitions
+# -------
+
+# The dayrows expansion and pivot_table previously used in get_school_dates, kept for comparison
+def legacy_binarydayrows(combo_df):
+    dayrows_df = expand_dayrows(combo_df)
+    binarydayrows_df = dayrows_df.pivot_table(
+        index=['Calendar_Year', 'School_Period_Type', 'Date'], columns='State',
+        values='State', aggfunc=lambda x: 1).fillna(0).reset_index()
+    float_cols = binarydayrows_df.select_dtypes(include=['float']).columns
+    binarydayrows_df[float_cols] = binarydayrows_df[float_cols].astype(int)
+    binarydayrows_df.columns.name = None
+    return binarydayrows_df
+
+
+# --------------------
+# Running the benchmark
+# --------------------
+
+if __name__ == '__main__':
+
+    print(f'{"Years":<12}{"periods":>9}{"rows":>9}{"pivot s":>10}{"engine s":>10}'
+          f'{"pivot MiB":>11}{"engine MiB":>12}')
+
+    # Multi decade ranges of all states with terms included, checking both give the same output for each
+    for start_year, end_year in [(2010, 2029), (1990, 2029), (1930, 2029)]:
+        combo_df = synthetic_combo_df(start_year, end_year)
+        expected, pivot_seconds, pivot_peak = measure(legacy_binarydayrows, combo_df)
+        actual, engine_seconds, engine_peak = measure(build_binarydayrows, combo_df)
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+        print(f'{f"{start_year}-{end_year}":<12}{len(combo_df):>9}{len(actual):>9}{pivot_seconds:>10.3f}'
+              f'{engine_seconds:>10.3f}{pivot_peak / 2 ** 20:>11.1f}{engine_peak / 2 ** 20:>12.1f}')
+
+    # The optional columns, which come from the same state matrix
+    _, extras_seconds, _ = measure(build_binarydayrows, combo_df, True, True)
+    print(f'\nWith State_Mask and State_Count columns: {extras_seconds:.3f}s')
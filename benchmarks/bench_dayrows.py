@@ -0,0 +1,83 @@
+import pathlib
+import sys
+import warnings
+import pandas as pd
+
+# Making the au_school_holidays package importable when run as a script
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.resolve()))
+
+from au_school_holidays.expansion import expand_dayrows
+from measuring import timed
+
+STATES = ['NSW', 'QLD', 'SA', 'VIC', 'WA', 'NT', 'ACT', 'TAS']
+
+
+# -------
+# Function definitions
+# -------
+
+# Builds a synthetic combo_df with 4 terms and 4 holidays per state and year, terms included
+def synthetic_combo_df(start_year, end_year, states=None):
+    if states is None:
+        states = STATES
+
+    rows = []
+    for state_number, state in enumerate(states):
+        for year in range(start_year, end_year + 1):
+            period_start = pd.Timestamp(year, 1, 27 + state_number % 4)
+            for term in range(1, 5):
+                term_finish = period_start + pd.Timedelta(days=69)
+                holiday_finish = term_finish + pd.Timedelta(days=15 if term < 4 else 40)
+                rows.append([year, state, 'Term', f'Term {term}', period_start, term_finish])
+                rows.append([year, state, 'Holiday', f'Term {term} Holidays',
+                             term_finish + pd.Timedelta(days=1), holiday_finish])
+                period_start = holiday_finish + pd.Timedelta(days=1)
+
+    return pd.DataFrame(rows, columns=['Calendar_Year', 'State', 'School_Period_Type', 'School_Period_Name',
+                                       'Start', 'Finish'])
+
+
+# The iterrows and repeated concat expansion previously used in get_school_dates, kept for comparison
+def legacy_expand_dayrows(combo_df):
+    dayrows_df = pd.DataFrame(
+        columns=['Calendar_Year', 'State', 'School_Period_Type', 'School_Period_Name', 'Date'])
+
+    for index, row in combo_df.iterrows():
+        date_range = pd.date_range(row['Start'], row['Finish'])
+        temp_df = pd.DataFrame({
+            'Calendar_Year': [row['Calendar_Year']] * len(date_range),
+            'State': [row['State']] * len(date_range),
+            'School_Period_Type': [row['School_Period_Type']] * len(date_range),
+            'School_Period_Name': [row['School_Period_Name']] * len(date_range),
+            'Date': date_range
+        })
+        # Silencing pandas' warning about concatenating onto the initial empty frame
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', FutureWarning)
+            dayrows_df = pd.concat([dayrows_df, temp_df])
+
+    return dayrows_df.reset_index(drop=True)
+
+
+# --------------------
+# Running the benchmark
+# --------------------
+
+if __name__ == '__main__':
+
+    # Checking the output matches the legacy expansion on a small range
+    small_df = synthetic_combo_df(2010, 2014)
+    expected = legacy_expand_dayrows(small_df)
+    actual = expand_dayrows(small_df)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+    print(f'Correctness check passed on {len(small_df)} periods ({len(actual)} day rows)')
+
+    # Timing both on a 50 year, all states, terms included dataset
+    large_df = synthetic_combo_df(1980, 2029)
+    actual, vectorized_seconds = timed(expand_dayrows, large_df)
+    expected, legacy_seconds = timed(legacy_expand_dayrows, large_df)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+    print(f'{len(large_df)} periods -> {len(actual)} day rows')
+    print(f'Legacy iterrows + concat: {legacy_seconds:.3f}s')
+    print(f'Vectorized:               {vectorized_seconds:.3f}s ({legacy_seconds / vectorized_seconds:.0f}x faster)')
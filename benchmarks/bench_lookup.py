@@ -0,0 +1,67 @@
+import pathlib
+import sys
+import numpy as np
+import pandas as pd
+
+# Making the au_school_holidays package importable when run as a script
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.resolve()))
+
+from bench_dayrows import STATES, synthetic_combo_df
+from au_school_holidays.expansion import expand_dayrows
+from au_school_holidays.lookup import HolidayIndex
+from measuring import measure, timed
+
+# Number of (date, state) queries in the batch
+QUERY_COUNT = 1_000_000
+
+
+# -------
+# Function definitions
+# -------
+
+# Answers the queries by expanding the periods to day rows and joining on state and date
+def dayrows_join_lookup(combo_df, dates, states):
+    holidays_df = combo_df[combo_df['School_Period_Type'] == 'Holiday']
+    dayrows_df = expand_dayrows(holidays_df)
+    queries_df = pd.DataFrame({'Date': dates, 'State': states})
+    joined_df = queries_df.merge(dayrows_df[['State', 'Date', 'School_Period_Name']], on=['State', 'Date'], how='left')
+    return joined_df['School_Period_Name'].to_numpy()
+
+
+# Answers the queries with a HolidayIndex, including the time taken to build it
+def index_lookup(combo_df, dates, states):
+    return HolidayIndex(combo_df).lookup(dates, states)['School_Period_Name'].to_numpy()
+
+
+# --------------------
+# Running the benchmark
+# --------------------
+
+if __name__ == '__main__':
+
+    # 50 years of all states with terms included, and a batch of random transaction dates and states
+    combo_df = synthetic_combo_df(1980, 2029)
+    random = np.random.default_rng(0)
+    dates = pd.Timestamp(1980, 1, 1) + pd.to_timedelta(random.integers(0, 50 * 365, QUERY_COUNT), unit='D')
+    states = np.array(STATES, dtype=object)[random.integers(0, len(STATES), QUERY_COUNT)]
+
+    join_names, join_seconds, join_peak = measure(dayrows_join_lookup, combo_df, dates, states)
+    index_names, index_seconds, index_peak = measure(index_lookup, combo_df, dates, states)
+
+    # The index is built once and then reused for every batch, so also timing a lookup on its own
+    index = HolidayIndex(combo_df)
+    _, query_seconds, query_peak = measure(index.lookup, dates, states)
+
+    # Checking both approaches find the same period for every query
+    assert pd.Series(join_names).fillna('').equals(pd.Series(index_names).fillna('')), 'Lookups differ'
+    print(f'Both approaches agree on {QUERY_COUNT:,} queries over {len(combo_df)} periods\n')
+
+    print(f'{"Approach":<20}{"seconds":>10}{"peak MiB":>12}')
+    print(f'{"dayrows join":<20}{join_seconds:>10.3f}{join_peak / 2 ** 20:>12.1f}')
+    print(f'{"HolidayIndex":<20}{index_seconds:>10.3f}{index_peak / 2 ** 20:>12.1f}')
+    print(f'{"  lookup only":<20}{query_seconds:>10.3f}{query_peak / 2 ** 20:>12.1f}')
+
+    # Range query
+    holiday_days, range_seconds = timed(index.holiday_days, '2000-01-01', '2009-12-31')
+    print(f'\nHoliday days per state 2000-2009 in {range_seconds * 1000:.2f}ms:')
+    print(holiday_days.to_string())
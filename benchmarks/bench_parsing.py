@@ -0,0 +1,109 @@
+import os
+import pathlib
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from bs4 import BeautifulSoup
+
+# Making the au_school_holidays package importable when run as a script
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.resolve()))
+
+from au_school_holidays.parsing import PARSER_BACKENDS, extract_table
+from measuring import measure, timed
+
+# Saved pages are read from the page cache by default, or from a folder of .html files passed as an argument
+DEFAULT_PAGES_FOLDER = pathlib.Path(__file__).parent.parent.resolve() / 'HTTP Cache'
+
+# Number of times each page is parsed when timing
+REPEATS = 20
+
+# Number of worker processes used when timing parsing in a pool
+POOL_WORKERS = os.cpu_count() or 1
+
+# Pages which the backends have disagreed on, added to the saved pages when checking the backends agree
+# A utf-8 page without a <meta charset>, and a table nested inside a cell
+EDGE_CASE_PAGES = ['<table><tr><td>6 July – Friday</td><td>Term\xa01</td></tr></table>'.encode(),
+                   b'<table><tr><td>a</td><td><table><tr><td>in</td></tr></table></td></tr></table>']
+
+
+# -------
+# Function definitions
+# -------
+
+# The full page BeautifulSoup parse previously used in get_school_dates, kept for comparison
+def legacy_extract_table(content):
+    soup = BeautifulSoup(content, "html.parser")
+    table = soup.find("table")
+    table_data = []
+    for row in table.find_all("tr"):
+        row_data = []
+        for cell in row.find_all(["th", "td"]):
+            row_data.append(cell.get_text(strip=True))
+        table_data.append(row_data)
+    return table_data
+
+
+# Parses every page REPEATS times with a backend
+def parse_repeatedly(backend, pages):
+    for _ in range(REPEATS):
+        for content in pages:
+            backend(content)
+
+
+# Returns the mean seconds per page and the peak traced memory in bytes for a backend
+def measure_backend(backend, pages):
+    _, seconds = timed(parse_repeatedly, backend, pages)
+
+    # Measuring peak memory separately, a page at a time, so tracing doesn't skew the timings
+    peak_bytes = max(measure(backend, content)[2] for content in pages)
+
+    return seconds / (REPEATS * len(pages)), peak_bytes
+
+
+# Returns the table data of every page parsed in a pool of worker processes, in page order
+def parse_in_pool(pool, backend_name, pages):
+    futures = [pool.submit(extract_table, content, backend_name) for content in pages]
+    return [future.result() for future in futures]
+
+
+# --------------------
+# Running the benchmark
+# --------------------
+
+if __name__ == '__main__':
+
+    pages_folder = pathlib.Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PAGES_FOLDER
+    pages = [path.read_bytes() for path in sorted(pages_folder.glob('*.html'))]
+    if not pages:
+        sys.exit(f'No saved .html pages found in {pages_folder}, run get_school_dates with a cache first '
+                 f'or pass a folder of saved pages.')
+
+    backends = {'legacy (full bs4)': legacy_extract_table,
+                **{name: function for name, function in PARSER_BACKENDS.items()}}
+
+    # Checking every backend gives identical table data, for the saved pages and the edge cases
+    check_pages = pages + EDGE_CASE_PAGES
+    expected = [legacy_extract_table(content) for content in check_pages]
+    for name, backend in backends.items():
+        try:
+            assert [backend(content) for content in check_pages] == expected, f'{name} table data differs'
+        except ImportError as e:
+            print(f'Skipping {name}: {e}')
+            backends = {key: value for key, value in backends.items() if key != name}
+    print(f'All backends give identical table data for {len(pages)} pages from {pages_folder} '
+          f'and {len(EDGE_CASE_PAGES)} edge cases\n')
+
+    print(f'{"Backend":<20}{"ms per page":>14}{"peak KiB":>12}')
+    for name, backend in backends.items():
+        seconds_per_page, peak_bytes = measure_backend(backend, pages)
+        print(f'{name:<20}{seconds_per_page * 1000:>14.3f}{peak_bytes / 1024:>12.0f}')
+    print('\nPeak memory is traced Python allocations only, memory allocated inside lxml is not included.')
+
+    # Parsing every page REPEATS times in a pool of worker processes, checking the results come back in order
+    print(f'\n{"Backend":<20}{"ms per page, " + str(POOL_WORKERS) + " processes":>30}')
+    with ProcessPoolExecutor(max_workers=POOL_WORKERS) as pool:
+        for name in PARSER_BACKENDS:
+            if name not in backends:
+                continue
+            assert parse_in_pool(pool, name, check_pages) == expected, f'{name} table data differs in the pool'
+            _, seconds = timed(lambda: [parse_in_pool(pool, name, pages) for _ in range(REPEATS)])
+            print(f'{name:<20}{seconds / (REPEATS * len(pages)) * 1000:>30.3f}')
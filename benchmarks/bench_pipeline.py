@@ -0,0 +1,137 @@
+import argparse
+import json
+import pathlib
+import sys
+import tempfile
+import time
+
+# Making the au_school_holidays package importable when run as a script
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.resolve()))
+
+from fixtures import FIXTURES_FOLDER, FixtureServer, local_states_list
+from measuring import peak_rss_mib, run_child
+from au_school_holidays.metrics import STAGES, RunMetrics
+
+# Stored results compared against on each run, written with --update-baseline
+BASELINE_PATH = pathlib.Path(__file__).parent.resolve() / 'pipeline_baseline.json'
+
+ALL_STATES = ['nsw', 'qld', 'sa', 'vic', 'wa', 'nt', 'act', 'tas']
+
+# Small and large ranges for each output mode, plus a large range with latency and injected faults
+SCENARIOS = [{'name': f'{size} {mode}', 'output_mode': mode, **ranges}
+             for size, ranges in [('small', {'start_year': 2024, 'end_year': 2025, 'targets': ['nsw', 'vic']}),
+                                  ('large', {'start_year': 2010, 'end_year': 2026, 'targets': ALL_STATES})]
+             for mode in ['startfinish', 'dayrows', 'binarydayrows']]
+SCENARIOS.append({'name': 'large faults startfinish', 'output_mode': 'startfinish', 'start_year': 2010,
+                  'end_year': 2026, 'targets': ALL_STATES, 'latency': 0.02, 'error_rate': 0.15})
+
+
+# -------
+# Function definitions
+# -------
+
+# Runs one scenario in this process against the fixture server at base_url, returning its measurements
+# Each scenario runs in its own process so peak RSS isn't carried over from earlier scenarios
+def run_scenario(scenario, base_url):
+    from au_school_holidays.scraper import get_school_dates
+
+    # Stage timings and counters collected by get_school_dates itself
+    metrics = RunMetrics()
+
+    with tempfile.TemporaryDirectory() as output_folder:
+        start = time.perf_counter()
+        output_dfs = get_school_dates(scenario['start_year'],
+                                      scenario['end_year'],
+                                      output_folder,
+                                      output_mode=scenario['output_mode'],
+                                      targets=scenario['targets'],
+                                      states_list=local_states_list(base_url),
+                                      timeout=1,
+                                      backoff_factor=0.01,
+                                      metrics=metrics)
+        total_seconds = time.perf_counter() - start
+
+    rows = len(output_dfs[scenario['output_mode']])
+    return {'total_seconds': total_seconds,
+            'stage_seconds': metrics.timings,
+            'counters': metrics.counters,
+            'peak_rss_mib': peak_rss_mib(),
+            'rows': rows,
+            'rows_per_second': rows / total_seconds}
+
+
+# Runs a scenario in a child process against a fixture server with the scenario's latency and faults
+def run_scenario_process(scenario):
+    with FixtureServer(latency=scenario.get('latency', 0.0),
+                       error_rate=scenario.get('error_rate', 0.0),
+                       timeout_seconds=1.5) as server:
+        return run_child(__file__, [json.dumps(scenario), server.base_url], f"Scenario {scenario['name']}")
+
+
+# Returns a list of messages for measurements which are worse than the baseline by more than the tolerance
+def find_regressions(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for measure in ['total_seconds', 'peak_rss_mib']:
+            limit = baseline[name][measure] * (1 + tolerance)
+            if result[measure] > limit:
+                regressions.append(f'{name}: {measure} {result[measure]:.2f} is over the baseline '
+                                   f'{baseline[name][measure]:.2f} by more than {tolerance:.0%}')
+    return regressions
+
+
+# --------------------
+# Running the benchmark
+# --------------------
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Run get_school_dates offline against recorded pages.')
+    parser.add_argument('--child', nargs=2, metavar=('SCENARIO', 'BASE_URL'), help=argparse.SUPPRESS)
+    parser.add_argument('--update-baseline', action='store_true', help='Store these results as the baseline.')
+    parser.add_argument('--tolerance', type=float, default=0.3,
+                        help='Fraction a measurement can be worse than the baseline before failing (default 0.3).')
+    parser.add_argument('--only', help='Only run scenarios with names containing this text.')
+    args = parser.parse_args()
+
+    # Child process, runs a single scenario and prints its measurements as json
+    if args.child:
+        print(json.dumps(run_scenario(json.loads(args.child[0]), args.child[1])))
+        sys.exit()
+
+    if not (FIXTURES_FOLDER / 'index.json').exists():
+        sys.exit(f'No recorded pages in {FIXTURES_FOLDER}, run benchmarks/record_fixtures.py first '
+                 f'(or with --synthetic to generate them).')
+
+    # Running each scenario and reporting its measurements
+    results = {}
+    stages = STAGES
+    print(f'{"Scenario":<28}{"total s":>9}' + ''.join(f'{stage:>14}' for stage in stages)
+          + f'{"peak MiB":>10}{"rows":>8}{"rows/s":>10}')
+    for scenario in SCENARIOS:
+        if args.only and args.only not in scenario['name']:
+            continue
+        result = run_scenario_process(scenario)
+        results[scenario['name']] = result
+        print(f'{scenario["name"]:<28}{result["total_seconds"]:>9.3f}'
+              + ''.join(f'{result["stage_seconds"][stage]:>14.3f}' for stage in stages)
+              + f'{result["peak_rss_mib"]:>10.1f}{result["rows"]:>8}{result["rows_per_second"]:>10.0f}')
+
+    if args.update_baseline:
+        baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+        BASELINE_PATH.write_text(json.dumps({**baseline, **results}, indent=2))
+        print(f'\nBaseline updated in {BASELINE_PATH}')
+        sys.exit()
+
+    # Timings depend on the machine, so the baseline is stored locally rather than committed, and a run without
+    # one fails instead of passing without checking anything
+    if not BASELINE_PATH.exists():
+        sys.exit('\nNo baseline to compare against, run with --update-baseline to store one.')
+
+    regressions = find_regressions(results, json.loads(BASELINE_PATH.read_text()), args.tolerance)
+    if regressions:
+        print('\nRegressions against the baseline:\n' + '\n'.join(regressions))
+        sys.exit(1)
+    print('\nNo regressions against the baseline.')
@@ -0,0 +1,174 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+import copy
+import datetime
+import pathlib
+import random
+import sys
+import threading
+import time
+import zlib
+
+# Making the au_school_holidays package importable
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.resolve()))
+
+from au_school_holidays.cache import ResponseCache
+from au_school_holidays.states import STATES_LIST, build_url
+
+# Recorded pages are kept in a response cache folder, keyed by their live url
+FIXTURES_FOLDER = pathlib.Path(__file__).parent.resolve() / 'fixtures'
+
+
+# -------
+# Function definitions
+# -------
+
+# Urls get_school_dates would fetch for a range of years, skipping years below the minimum and skip years
+def planned_urls(start_year, end_year, targets=None):
+    if targets is None:
+        targets = list(STATES_LIST)
+
+    urls = []
+    for target_state in targets:
+        for year in range(start_year, end_year + 1):
+            if year < STATES_LIST[target_state]['min'] or year in STATES_LIST[target_state]['skipyears']:
+                continue
+            urls.append((target_state, year, build_url(target_state, year)))
+    return urls
+
+
+# Points a live url at the fixture server, e.g. https://host/path becomes {base_url}/host/path
+def local_url(url, base_url):
+    parsed = urlparse(url)
+    return f'{base_url}/{parsed.netloc}{parsed.path}'
+
+
+# Copy of the states_list registry with every url pointed at the fixture server
+def local_states_list(base_url):
+    states_list = copy.deepcopy(STATES_LIST)
+    for state_info in states_list.values():
+        state_info['url'] = local_url(state_info['url'], base_url)
+        state_info['altyears'] = {year: local_url(url, base_url) for year, url in state_info['altyears'].items()}
+    return states_list
+
+
+# Formats a date the way the state sites do, e.g. Tuesday 28th January
+def _site_date(date, with_year):
+    suffix = 'th' if 11 <= date.day <= 13 else {1: 'st', 2: 'nd', 3: 'rd'}.get(date.day % 10, 'th')
+    text = f"{date.strftime('%A')} {date.day}{suffix} {date.strftime('%B')}"
+    return f'{text} {date.year}' if with_year else text
+
+
+# Builds a page shaped like a state site's page, with navigation either side of a table of terms and holidays
+def synthetic_page(target_state, year):
+    rows = ['<tr><th>Period</th><th>Start</th><th>Finish</th><th>Length</th></tr>']
+    rng = random.Random(zlib.crc32(f'{target_state}{year}'.encode()))
+    term_start = datetime.date(year, 1, 27) + datetime.timedelta(days=rng.randint(0, 5))
+    for term in range(1, 5):
+        term_finish = term_start + datetime.timedelta(days=69)
+        holiday_start = term_finish + datetime.timedelta(days=1)
+        holiday_finish = holiday_start + datetime.timedelta(days=15 if term < 4 else 40)
+        provisional = ' (TBC)' if term == 4 and rng.random() < 0.5 else ''
+        rows.append(f'<tr><td>Term {term}</td><td>{_site_date(term_start, False)}</td>'
+                    f'<td>{_site_date(term_finish, True)}</td><td>10 weeks</td></tr>')
+        rows.append(f'<tr><td>Term {term} Holidays</td><td>{_site_date(holiday_start, False)}</td>'
+                    f'<td>{_site_date(holiday_finish, True)}{provisional}</td><td>2 weeks</td></tr>')
+        if term == 2:
+            rows.append('<tr><td colspan="4">*Some schools have different dates, details below:</td></tr>')
+        term_start = holiday_finish + datetime.timedelta(days=1)
+
+    navigation = '<li><a href="/">School holiday dates</a></li>' * 400
+    return (f'<html><head><title>{target_state.upper()} School Holidays {year}</title></head><body>'
+            f'<ul class="nav">{navigation}</ul><table>{"".join(rows)}</table>'
+            f'<ul class="footer">{navigation}</ul></body></html>').encode()
+
+
+# -------
+# Class definitions
+# -------
+
+# Serves recorded pages, with a path of /host/path for each https://host/path
+class _FixtureHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        server = self.server
+        url = 'https://' + self.path.lstrip('/')
+
+        # Simulating network latency
+        time.sleep(server.latency)
+
+        # Injected faults, 5xx errors and timeouts only happen on the first fault_attempts requests for a url
+        fault = server.fault_for(url)
+        if fault == 'timeout':
+            time.sleep(server.timeout_seconds)
+            return
+        if fault is not None:
+            self.send_error(int(fault))
+            return
+
+        if url not in server.pages:
+            self.send_error(404)
+            return
+
+        body = server.pages[url]
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    # Keeping the benchmark output clean
+    def log_message(self, format, *args):
+        pass
+
+
+# Local stand in for the state sites, replaying the pages in the fixtures folder from a background thread
+# Faults are picked per url from its hash, so the same urls fail on every run with the same settings
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self,
+                 fixtures_folder=FIXTURES_FOLDER,
+                 latency=0.0,
+                 error_rate=0.0,
+                 error_kinds=('404', '500', '503', 'timeout'),
+                 fault_attempts=1,
+                 timeout_seconds=2.0):
+        super().__init__(('127.0.0.1', 0), _FixtureHandler)
+        cache = ResponseCache(fixtures_folder)
+        self.pages = {url: cache.get(url)['content'] for url in cache.urls()}
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_kinds = list(error_kinds)
+        self.fault_attempts = fault_attempts
+        self.timeout_seconds = timeout_seconds
+        self._attempts = {}
+        self._attempts_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+    # Returns the fault to inject for a request to a url, or None to serve it normally
+    def fault_for(self, url):
+        url_hash = zlib.crc32(url.encode())
+        if url_hash % 1000 >= self.error_rate * 1000:
+            return None
+        fault = self.error_kinds[url_hash % len(self.error_kinds)]
+
+        # Missing pages stay missing, other faults are transient
+        if fault == '404':
+            return fault
+        with self._attempts_lock:
+            self._attempts[url] = self._attempts.get(url, 0) + 1
+            return fault if self._attempts[url] <= self.fault_attempts else None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,47 @@
+import json
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+
+# -------
+# Function definitions
+# -------
+
+# Times a function, returning its result and the elapsed seconds
+# Nothing is traced, for timings that tracemalloc's overhead would skew
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+# Returns the result, elapsed seconds and peak traced memory in bytes of a function
+def measure(function, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(*args)
+    seconds = time.perf_counter() - start
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak_bytes
+
+
+# Returns the peak resident memory of this process so far in MiB
+def peak_rss_mib():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss / 2 ** 20 if sys.platform == 'darwin' else peak_rss / 2 ** 10
+
+
+# Runs a benchmark script in a child process with --child and the given arguments, returning the measurements it
+# prints as json on its last line
+# Each run gets its own process so peak RSS and imported modules aren't carried over from earlier runs
+def run_child(script, child_args, description):
+    completed = subprocess.run([sys.executable, str(script), '--child', *child_args],
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f'{description} failed:\n{completed.stderr}')
+    return json.loads(completed.stdout.strip().splitlines()[-1])
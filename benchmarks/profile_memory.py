@@ -0,0 +1,160 @@
+import argparse
+import hashlib
+import json
+import pathlib
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+import tracemalloc
+
+# Making the au_school_holidays package importable when run as a script
+REPO_ROOT = pathlib.Path(__file__).parent.parent.resolve()
+sys.path.insert(0, str(REPO_ROOT))
+
+from fixtures import FIXTURES_FOLDER, FixtureServer, local_states_list
+from measuring import peak_rss_mib, run_child
+
+ALL_STATES = ['nsw', 'qld', 'sa', 'vic', 'wa', 'nt', 'act', 'tas']
+
+# Long range with every state and the terms kept, the largest dayrows output a run normally makes
+SCENARIO = {'start_year': 2010, 'end_year': 2030, 'targets': ALL_STATES, 'output_mode': 'dayrows',
+            'drop_terms': False}
+
+
+# -------
+# Function definitions
+# -------
+
+# Runs the scenario in this process with the get_school_dates from repo_root, returning its memory measurements
+# tracemalloc is started once everything is imported, so its peaks are what the run itself allocates
+def profile_run(repo_root, base_url):
+    sys.path.insert(0, str(repo_root))
+
+    # fixtures imports the package from this tree, so it is dropped to import the one in repo_root instead
+    for name in [name for name in sys.modules if name.split('.')[0] == 'au_school_holidays']:
+        del sys.modules[name]
+
+    # Also importing the modules get_school_dates imports lazily, so their import isn't counted in the run
+    # Revisions from before the modules moved into the package have them in the repo root
+    if (pathlib.Path(repo_root) / 'au_school_holidays').is_dir():
+        from au_school_holidays import fetching, parsing
+        from au_school_holidays.metrics import RunMetrics
+        from au_school_holidays.scraper import get_school_dates
+    else:
+        import fetching
+        import parsing
+        from metrics import RunMetrics
+        from Main import get_school_dates
+    parsing.extract_table(b'<table><tr><td>x</td></tr></table>')
+
+    # Peak traced memory of each stage, taken as each pass through a stage is timed
+    # Whatever runs between two stages is counted in the later one
+    stage_peaks = {}
+
+    def record_stage_peak(event, name, value):
+        if event == 'timing':
+            stage_peaks[name] = max(stage_peaks.get(name, 0), tracemalloc.get_traced_memory()[1] / 2 ** 20)
+            tracemalloc.reset_peak()
+
+    with tempfile.TemporaryDirectory() as output_folder:
+        tracemalloc.start()
+        metrics = RunMetrics(hooks=[record_stage_peak])
+        start = time.perf_counter()
+        output_dfs = get_school_dates(SCENARIO['start_year'],
+                                      SCENARIO['end_year'],
+                                      output_folder,
+                                      output_mode=SCENARIO['output_mode'],
+                                      targets=SCENARIO['targets'],
+                                      drop_terms=SCENARIO['drop_terms'],
+                                      states_list=local_states_list(base_url),
+                                      timeout=1,
+                                      backoff_factor=0.01,
+                                      metrics=metrics)
+        total_seconds = time.perf_counter() - start
+        stage_peaks['end of run'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+
+        # Output as written, to check both runs give the same file
+        output_path = pathlib.Path(output_folder) / (f"AU School Hols - Data - {SCENARIO['start_year']}-"
+                                                     f"{SCENARIO['end_year']} - {SCENARIO['output_mode']}.csv")
+        output_bytes = output_path.read_bytes()
+
+    dayrows_df = output_dfs[SCENARIO['output_mode']]
+    return {'total_seconds': total_seconds,
+            'peak_traced_mib': max(stage_peaks.values()),
+            'stage_peak_mib': stage_peaks,
+            'peak_rss_mib': peak_rss_mib(),
+            'output_mib': dayrows_df.memory_usage(deep=True).sum() / 2 ** 20,
+            'rows': len(dayrows_df),
+            'dtypes': {column: str(dtype) for column, dtype in dayrows_df.dtypes.items()},
+            'output_size': len(output_bytes),
+            'output_hash': hashlib.sha256(output_bytes).hexdigest()}
+
+
+# Runs the scenario in a child process with the get_school_dates from repo_root
+def profile_run_process(repo_root, base_url):
+    return run_child(__file__, [str(repo_root), base_url], f'Profile run in {repo_root}')
+
+
+# Extracts the repo as it was at a git revision into a folder, for profiling the code before a change
+def extract_revision(revision, folder):
+    archive = subprocess.run(['git', 'archive', '--format=tar', revision], cwd=REPO_ROOT,
+                             capture_output=True, check=True).stdout
+    with tempfile.TemporaryFile() as archive_file:
+        archive_file.write(archive)
+        archive_file.seek(0)
+        with tarfile.open(fileobj=archive_file) as tar:
+            tar.extractall(folder)
+
+
+# --------------------
+# Running the profile
+# --------------------
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Profile the peak memory of a 2010-2030, all states, terms '
+                                                 'included dayrows run, against recorded pages.')
+    parser.add_argument('--child', nargs=2, metavar=('REPO_ROOT', 'BASE_URL'), help=argparse.SUPPRESS)
+    parser.add_argument('--before', metavar='REVISION',
+                        help='Git revision to profile as well and compare against, e.g. HEAD~1.')
+    parser.add_argument('--report', help='Path to write the measurements to as json.')
+    args = parser.parse_args()
+
+    # Child process, runs the scenario once and prints its measurements as json
+    if args.child:
+        print(json.dumps(profile_run(args.child[0], args.child[1])))
+        sys.exit()
+
+    if not (FIXTURES_FOLDER / 'index.json').exists():
+        sys.exit(f'No recorded pages in {FIXTURES_FOLDER}, run benchmarks/record_fixtures.py 2010 2030 first '
+                 f'(or with --synthetic to generate them).')
+
+    # Profiling this tree, and the revision given with --before, each in its own process
+    results = {}
+    with FixtureServer() as server, tempfile.TemporaryDirectory() as before_folder:
+        if args.before:
+            extract_revision(args.before, before_folder)
+            results['before'] = profile_run_process(before_folder, server.base_url)
+        results['after'] = profile_run_process(REPO_ROOT, server.base_url)
+
+    print(f'{"Run":<10}{"total s":>9}{"peak traced MiB":>17}{"peak RSS MiB":>14}{"output MiB":>12}{"rows":>8}')
+    for name, result in results.items():
+        print(f'{name:<10}{result["total_seconds"]:>9.3f}{result["peak_traced_mib"]:>17.1f}'
+              f'{result["peak_rss_mib"]:>14.1f}{result["output_mib"]:>12.2f}{result["rows"]:>8}')
+    print(f'\n{"Peak traced MiB by stage":<28}' + ''.join(f'{name:>10}' for name in results))
+    for stage in results['after']['stage_peak_mib']:
+        print(f'{stage:<28}' + ''.join(f'{result["stage_peak_mib"].get(stage, 0):>10.1f}'
+                                       for result in results.values()))
+    for name, result in results.items():
+        print(f'\n{name} dtypes: ' + ', '.join(f'{column} {dtype}' for column, dtype in result['dtypes'].items()))
+
+    if args.report:
+        pathlib.Path(args.report).write_text(json.dumps({'scenario': SCENARIO, **results}, indent=2))
+
+    # Both runs have to write the same output
+    if 'before' in results and results['before']['output_hash'] != results['after']['output_hash']:
+        print('\nOutputs differ between the runs.')
+        sys.exit(1)
@@ -0,0 +1,42 @@
+import argparse
+import pathlib
+import sys
+
+# Making the au_school_holidays package importable when run as a script
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent.resolve()))
+
+from au_school_holidays.cache import CachedResponse, ResponseCache
+from au_school_holidays.fetching import fetch_pages
+from fixtures import FIXTURES_FOLDER, planned_urls, synthetic_page
+
+# --------------------
+# Recording the pages
+# --------------------
+
+# Saves every page get_school_dates would fetch for a range of years into the fixtures folder, including
+# the altyears urls, so the pipeline benchmark can run offline against the fixture server
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Record state site pages for the offline pipeline benchmark.')
+    parser.add_argument('start_year', type=int, nargs='?', default=2014)
+    parser.add_argument('end_year', type=int, nargs='?', default=2026)
+    parser.add_argument('--synthetic', action='store_true',
+                        help='Write generated pages for every url instead of fetching the live sites.')
+    args = parser.parse_args()
+
+    urls = planned_urls(args.start_year, args.end_year)
+
+    # Every page is re-fetched when recording, rather than being served from earlier recordings
+    fixtures = ResponseCache(FIXTURES_FOLDER, ttl={'past': 0, 'current': 0, 'future': 0})
+
+    if args.synthetic:
+        for target_state, year, url in urls:
+            fixtures.put(url, CachedResponse(url, synthetic_page(target_state, year)))
+        print(f'Wrote {len(urls)} synthetic pages to {FIXTURES_FOLDER}')
+    else:
+        responses = fetch_pages([url for _, _, url in urls], cache=fixtures)
+        recorded = [url for url, response in responses.items() if getattr(response, 'status_code', None) == 200]
+        print(f'Recorded {len(recorded)} of {len(urls)} pages to {FIXTURES_FOLDER}')
+        for url in sorted(set(responses) - set(recorded)):
+            print(f'Not recorded: {url} ({getattr(responses[url], "status_code", responses[url])})')